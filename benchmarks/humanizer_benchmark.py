@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: humanizer_benchmark.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Micro-benchmark of the scalar and vectorized humanizer paths.
+
+Formats a table of random values spanning every magnitude, with missing
+values, once per cell with the scalar formatters and once per column with
+the vectorized ones, checking that both give the same strings.
+
+Usage:
+    python -m benchmarks.humanizer_benchmark [--tickets 1000] [--metrics 40] [--repeat 5]
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from fundamentus_hub.utilities.humanizer import (format_changes, format_metrics_value,
+                                                 format_metrics_values, format_numbers,
+                                                 format_value, humanize_number, humanize_numbers,
+                                                 to_percentage, to_percentages)
+
+# Share of missing cells, as in the indicators of the banks.
+MISSING_SHARE = 0.1
+
+
+def format_change(value: float) -> str:
+    """Scalar reference of format_changes: a signed percentage, None if missing."""
+
+    if value is None or pd.isna(value):
+        return None
+
+    return f'{value * 100:+.2f}%'
+
+
+# Scalar and vectorized path of each format.
+FORMATS = {
+    'monetary': (humanize_number, humanize_numbers),
+    'percentage': (to_percentage, to_percentages),
+    'number': (format_value, format_numbers),
+    'change': (format_change, format_changes),
+    'currency': (lambda value: format_metrics_value(value, 'currency'),
+                 lambda values: format_metrics_values(values, 'currency')),
+}
+
+
+def build_table(tickets: int, metrics: int) -> pd.DataFrame:
+    """Random signed values from 0.001 to 1e12, some of them missing or zero."""
+
+    generator = np.random.default_rng(0)
+
+    values = generator.choice([-1, 1], (tickets, metrics)) * 10 ** generator.uniform(-3, 12, (
+        tickets, metrics))
+    values[generator.random((tickets, metrics)) < MISSING_SHARE] = np.nan
+    values[generator.random((tickets, metrics)) < 0.01] = 0
+
+    return pd.DataFrame(values.astype('float32'),
+                        columns=[f'metric_{index}' for index in range(metrics)])
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickets', type=int, default=1000)
+    parser.add_argument('--metrics', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    table = build_table(args.tickets, args.metrics)
+
+    for name, (scalar, vectorized) in FORMATS.items():
+        def scalar_path(scalar=scalar):
+            return table.apply(lambda column: column.astype(object).map(scalar))
+
+        def vectorized_path(vectorized=vectorized):
+            return table.apply(vectorized)
+
+        def table_path(vectorized=vectorized):
+            return pd.DataFrame(vectorized(table.to_numpy().ravel()).reshape(table.shape),
+                                columns=table.columns)
+
+        # Every path must give the same strings.
+        pd.testing.assert_frame_equal(scalar_path(), vectorized_path())
+        pd.testing.assert_frame_equal(scalar_path(), table_path())
+
+        times = [min(timeit.repeat(path, number=1, repeat=args.repeat)) * 1000
+                 for path in (scalar_path, vectorized_path, table_path)]
+
+        print(f'{name:>10}: scalar {times[0]:7.2f} ms, per column {times[1]:7.2f} ms '
+              f'({times[0] / times[1]:.1f}x), whole table {times[2]:7.2f} ms '
+              f'({times[0] / times[2]:.1f}x) for {table.size} cells')
+
+
+if __name__ == '__main__':
+    main()
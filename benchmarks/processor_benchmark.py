@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: processor_benchmark.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Micro-benchmark of the DataProcessor flattening paths.
+
+Compares the per-item dict building path (extract_information merged with
+update, then a DataFrame from a list of dicts) with the compiled flattening
+plan filling preallocated column arrays.
+
+Usage:
+    python -m benchmarks.processor_benchmark [--tickets 1000] [--repeat 5]
+"""
+
+import argparse
+import copy
+import timeit
+
+import pandas as pd
+from fundamentus.contracts.mocks.extract_contract import EXTRACT_CONTRACT_MOCK
+from fundamentus.stages.transformation.transform_raw_information import TransformRawInformation
+
+from fundamentus_hub.downloader.flattening import ColumnarBuffer
+from fundamentus_hub.downloader.handler import DataProcessor
+from fundamentus_hub.utilities.categories import FundamentusCategories as Categories
+
+
+def build_responses(tickets: int) -> list:
+    """Build independent copies of the pyfundamentus mock response."""
+
+    response = TransformRawInformation().transform_all_information(EXTRACT_CONTRACT_MOCK)
+
+    return [copy.deepcopy(response) for _ in range(tickets)]
+
+
+def dict_path(responses: list) -> pd.DataFrame:
+    """Per-item dict building, as DataProcessor used to do."""
+
+    processor = DataProcessor(Categories.categories.value)
+    processed_data = []
+
+    for response in responses:
+        temporal_data = {}
+        for category in Categories.categories.value:
+            data_section = response.transformed_information.get(category, {})
+            temporal_data.update(processor.extract_information(data_section))
+        processed_data.append(temporal_data)
+
+    return pd.DataFrame(processed_data)
+
+
+def plan_path(responses: list) -> pd.DataFrame:
+    """Compiled flattening plan filling preallocated column arrays."""
+
+    processor = DataProcessor(Categories.categories.value)
+    buffer = ColumnarBuffer(len(responses))
+
+    for response in responses:
+        buffer.append(processor.flatten(response))
+
+    return buffer.to_data_frame(processor.columns)
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tickets', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    responses = build_responses(args.tickets)
+
+    # Both paths must build the same table.
+    pd.testing.assert_frame_equal(dict_path(responses), plan_path(responses))
+
+    for name, function in (('dict', dict_path), ('plan', plan_path)):
+        best = min(timeit.repeat(lambda function=function: function(responses),
+                                 number=1,
+                                 repeat=args.repeat))
+        print(f'{name:>5}: {best * 1000:8.2f} ms for {args.tickets} tickets '
+              f'({best / args.tickets * 1_000_000:.2f} us/ticket)')
+
+
+if __name__ == '__main__':
+    main()
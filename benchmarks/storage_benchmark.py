@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: storage_benchmark.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""I/O benchmark of the snapshot formats and compression codecs.
+
+Writes and reads a snapshot with every format and codec available, then
+reports the write time, the full read time, the read time of a small
+portfolio and the bytes on disk. The delta store writes the snapshot on two
+consecutive days, the second one must be stored as an empty delta.
+
+The snapshot is the latest one in the manifest; without one, a synthetic
+snapshot is built from the pyfundamentus mock response.
+
+Usage:
+    python -m benchmarks.storage_benchmark [--data-path data//] [--tickets 1000] [--repeat 3]
+"""
+
+import argparse
+import copy
+import datetime
+import importlib.util
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fundamentus.contracts.mocks.extract_contract import EXTRACT_CONTRACT_MOCK
+from fundamentus.stages.transformation.transform_raw_information import TransformRawInformation
+
+from fundamentus_hub.downloader.flattening import ColumnarBuffer
+from fundamentus_hub.downloader.handler import DataProcessor
+from fundamentus_hub.storage.delta import DeltaSnapshotStore
+from fundamentus_hub.storage.manifest import SnapshotManifest
+from fundamentus_hub.storage.snapshots import (SnapshotStore, compression_suffix, read_entry,
+                                               read_snapshot, write_snapshot)
+from fundamentus_hub.utilities.categories import FundamentusCategories as Categories
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import CODE_COLUMN, enforce_schema
+
+# Codecs of the formats compressed as a whole file and of the parquet based ones.
+FILE_CODECS = [None, 'gzip', 'bz2', 'xz', 'zstd']
+PARQUET_CODECS = [None, 'snappy', 'gzip', 'brotli', 'lz4', 'zstd']
+PORTFOLIO_SIZE = 4
+
+
+def codec_available(file_format: str, codec: str) -> bool:
+    """Whether a codec can be used here, some of them need optional packages."""
+
+    if codec is None:
+        return True
+
+    if file_format in ('csv', 'pkl'):
+        return codec != 'zstd' or importlib.util.find_spec('zstandard') is not None
+
+    return pa.Codec.is_available(codec)
+
+
+def synthetic_snapshot(tickets: int) -> pd.DataFrame:
+    """Snapshot of the mock response for many tickers, with randomized numbers."""
+
+    response = TransformRawInformation().transform_all_information(EXTRACT_CONTRACT_MOCK)
+    processor = DataProcessor(Categories.categories.value)
+    buffer = ColumnarBuffer(tickets)
+
+    for ticket in range(tickets):
+        ticket_response = copy.deepcopy(response)
+        ticket_response.transformed_information['stock_identification']['name'].value = \
+            f'T{ticket:04d}'
+        buffer.append(processor.flatten(ticket_response))
+
+    data_frame = enforce_schema(buffer.to_data_frame(processor.columns))
+
+    # Identical rows would compress unrealistically well.
+    generator = np.random.default_rng(0)
+    for column in data_frame.select_dtypes('float').columns:
+        noise = generator.lognormal(0, 0.5, len(data_frame)).astype(data_frame[column].dtype)
+        data_frame[column] = data_frame[column] * noise
+
+    return data_frame
+
+
+def load_snapshot(data_path: str, tickets: int) -> pd.DataFrame:
+    """Latest snapshot of the manifest, or a synthetic one."""
+
+    manifest = SnapshotManifest(data_path)
+    entry = manifest.latest()
+
+    if entry is None:
+        print(f'No snapshot in {data_path}, using a synthetic one of {tickets} tickers')
+        return synthetic_snapshot(tickets)
+
+    print(f'Snapshot of {entry.date} ({entry.file_format}, {entry.rows} rows)')
+
+    return read_entry(manifest, entry)
+
+
+def directory_size(path: Path) -> int:
+    """Bytes of the files under a path."""
+
+    return sum(file.stat().st_size for file in path.rglob('*') if file.is_file())
+
+
+def measure(function, repeat: int) -> float:
+    """Best time of a function, in milliseconds."""
+
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def benchmark_file(data_frame: pd.DataFrame,
+                   directory: Path,
+                   file_format: str,
+                   codec: str,
+                   repeat: int) -> tuple:
+    """Write, read and portfolio read times and size of a snapshot file."""
+
+    file = directory / f'snapshot.{file_format}{compression_suffix(file_format, codec)}'
+    portfolio = list(data_frame[CODE_COLUMN].iloc[:PORTFOLIO_SIZE])
+
+    write = measure(lambda: write_snapshot(data_frame, file, codec), repeat)
+    read = measure(lambda: read_snapshot(file), repeat)
+    portfolio_read = measure(lambda: read_snapshot(file, portfolio), repeat)
+
+    return write, read, portfolio_read, file.stat().st_size
+
+
+def benchmark_store(data_frame: pd.DataFrame, directory: Path, codec: str, repeat: int) -> tuple:
+    """Write, read and portfolio read times and size of a snapshot store partition."""
+
+    store = SnapshotStore(directory / 'store',
+                          manifest=SnapshotManifest(str(directory)),
+                          compression=codec)
+    snapshot_date = datetime.date.today()
+    portfolio = list(data_frame[CODE_COLUMN].iloc[:PORTFOLIO_SIZE])
+
+    write = measure(lambda: store.write(data_frame, snapshot_date), repeat)
+    read = measure(lambda: store.read(snapshot_date), repeat)
+    portfolio_read = measure(lambda: store.read(snapshot_date, portfolio), repeat)
+
+    return write, read, portfolio_read, directory_size(store.partition_path(snapshot_date))
+
+
+def benchmark_delta(data_frame: pd.DataFrame, directory: Path, codec: str, repeat: int) -> tuple:
+    """Write, read and portfolio read times and size of an unchanged day of the delta store."""
+
+    store = DeltaSnapshotStore(directory / 'delta',
+                               manifest=SnapshotManifest(str(directory)),
+                               compression=codec)
+    first_date = datetime.date.today() - datetime.timedelta(days=1)
+    snapshot_date = datetime.date.today()
+    portfolio = list(data_frame[CODE_COLUMN].iloc[:PORTFOLIO_SIZE])
+
+    store.write(data_frame, first_date)
+    write = measure(lambda: store.write(data_frame, snapshot_date), repeat)
+    read = measure(lambda: store.read(snapshot_date), repeat)
+    portfolio_read = measure(lambda: store.read(snapshot_date, portfolio), repeat)
+
+    path = directory / 'delta' / f'{DeltaSnapshotStore.DELTA}-{snapshot_date.isoformat()}.parquet'
+    if not path.exists() or pq.read_metadata(path).num_rows:
+        raise RuntimeError(f'An unchanged snapshot was not stored as an empty delta: {path}')
+
+    return write, read, portfolio_read, path.stat().st_size
+
+
+def main() -> None:
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data-path', default=DownloadCfg.DATA_PATH.value)
+    parser.add_argument('--tickets', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data_frame = load_snapshot(args.data_path, args.tickets)
+
+    cases = ([('csv', codec) for codec in FILE_CODECS] +
+             [('pkl', codec) for codec in FILE_CODECS] +
+             [('parquet', codec) for codec in PARQUET_CODECS] +
+             [('store', codec) for codec in PARQUET_CODECS] +
+             [('delta', codec) for codec in PARQUET_CODECS])
+
+    print(f'{"format":>8} {"codec":>7} {"write ms":>9} {"read ms":>9} '
+          f'{"portfolio ms":>13} {"KiB":>9}')
+
+    for file_format, codec in cases:
+        if not codec_available(file_format, codec):
+            print(f'{file_format:>8} {codec:>7}   not available')
+            continue
+
+        with tempfile.TemporaryDirectory() as directory:
+            if file_format == 'store':
+                result = benchmark_store(data_frame, Path(directory), codec, args.repeat)
+            elif file_format == 'delta':
+                result = benchmark_delta(data_frame, Path(directory), codec, args.repeat)
+            else:
+                result = benchmark_file(data_frame, Path(directory), file_format, codec,
+                                        args.repeat)
+
+        write, read, portfolio_read, size = result
+        print(f'{file_format:>8} {codec or "none":>7} {write:9.2f} {read:9.2f} '
+              f'{portfolio_read:13.2f} {size / 1024:9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: data.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Snapshot loaders shared by the dashboard pages."""
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from fundamentus_hub.dashboard.view_model import SnapshotView, build_peer_view, build_view_model
+from fundamentus_hub.dashboard.widgets.stock_indicators import WIDGET_COLUMNS
+from fundamentus_hub.storage.manifest import ManifestEntry, SnapshotManifest
+from fundamentus_hub.storage.mapped import open_mapped_snapshot, select_rows
+from fundamentus_hub.storage.peers import open_peer_statistics
+from fundamentus_hub.storage.snapshots import SnapshotStore, read_entry, record_snapshot_files
+from fundamentus_hub.utilities.comparison import SnapshotChanges, compare_snapshots
+from fundamentus_hub.utilities.peers import PeerStatistics
+from fundamentus_hub.utilities.schema import CODE_COLUMN
+
+
+# Only the most recent snapshots stay mapped, older ones are released.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def open_shared_snapshot(entry: ManifestEntry) -> pa.Table:
+    """Open the memory-mapped snapshot once per process, shared by every session."""
+
+    return open_mapped_snapshot(SnapshotManifest(), entry)
+
+
+def resolve_snapshots() -> tuple:
+    """Manifest entries of the baseline (first) and latest snapshots."""
+
+    manifest = SnapshotManifest()
+
+    # Record the snapshots missing from the manifest, such as the ones written before
+    # it existed, where they are; converting them is left to --import-snapshots.
+    SnapshotStore(manifest=manifest).record_partitions()
+    record_snapshot_files(manifest)
+
+    return manifest.baseline(), manifest.latest()
+
+
+# Loads are keyed on the manifest entries, whose checksum changes with every
+# published snapshot, and kept on disk so a restart does not repeat them.
+@st.cache_data(show_spinner=False, persist='disk', max_entries=32)
+def load_snapshot_changes(baseline: ManifestEntry, latest: ManifestEntry) -> SnapshotChanges:
+    """Changes of every ticker between two snapshots, computed once per snapshot pair."""
+
+    return compare_snapshots(read_entry(SnapshotManifest(), baseline, columns=WIDGET_COLUMNS),
+                             select_rows(open_shared_snapshot(latest), columns=WIDGET_COLUMNS))
+
+
+# The view model is read-only, so every session shares the same frames instead of
+# unpickling a copy on every rerun; a restart rebuilds it from the cached changes.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_view_model(baseline: ManifestEntry, latest: ManifestEntry) -> SnapshotView:
+    """Formatted cells of every ticker of the latest snapshot, built once per snapshot pair."""
+
+    # Variations since the baseline snapshot, shown as the delta of the metrics.
+    changes = load_snapshot_changes(baseline, latest) if baseline != latest else None
+
+    # The latest snapshot comes from the mapped copy shared by the sessions.
+    return build_view_model(select_rows(open_shared_snapshot(latest), columns=WIDGET_COLUMNS),
+                            changes)
+
+
+# Shared by the sessions without copies, the frame must not be changed.
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_full_snapshot(latest: ManifestEntry) -> pd.DataFrame:
+    """Every ticker and column of the latest snapshot, indexed by ticker code."""
+
+    return select_rows(open_shared_snapshot(latest)).set_index(CODE_COLUMN)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_peer_statistics(latest: ManifestEntry) -> PeerStatistics:
+    """Formatted sector and subsector statistics of the latest snapshot, from their stored copy."""
+
+    return build_peer_view(open_peer_statistics(SnapshotManifest(), latest))
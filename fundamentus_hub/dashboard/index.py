@@ -18,85 +18,91 @@
 
 """Dashboard index page."""
 
-from pathlib import Path
-
-import pandas as pd
 import streamlit as st
 
+from fundamentus_hub.dashboard.data import (load_peer_statistics, load_view_model,
+                                            resolve_snapshots)
+from fundamentus_hub.dashboard.view_model import SnapshotView
 from fundamentus_hub.dashboard.widgets.indicator_metrics import create_indicator_metrics
 from fundamentus_hub.dashboard.widgets.stock_indicators import (
-    show_balance_sheet, show_income_statement_three_months,
+    PEER_METRICS, show_balance_sheet, show_income_statement_three_months,
     show_income_statement_twelve_months, show_indebtedness_indicators,
-    show_market_indicators, show_oscillations, show_profitability_indicators,
-    show_stock_price, show_valuation_indicators)
-from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+    show_market_indicators, show_oscillations, show_peer_comparison,
+    show_profitability_indicators, show_stock_price, show_valuation_indicators)
+from fundamentus_hub.utilities.configuration import StreamlitConfiguration as StreamlitCfg
+from fundamentus_hub.utilities.peers import PeerStatistics, peer_context
+
 
+def dasboard_index(portfolio: list) -> None:
+    """Dashboard index page."""
 
-@st.cache_data
-def load_and_filter_portfolio(_portfolio: list) -> pd.DataFrame:
-    """Load and filter portfolio."""
+    # with st.container():
+    #     create_indicator_metrics()
 
-    # Get the directory path.
-    directory_path = Path.cwd() / DownloadCfg.DATA_PATH.value
-    csv_files = list(directory_path.glob('*.csv'))
+    # Reading the manifest on every rerun picks up a newly published snapshot.
+    baseline, latest = resolve_snapshots()
+    if latest is None:
+        st.warning('Nenhum snapshot encontrado, execute o download dos dados primeiro.')
+        return
 
-    # Get the oldest and youngest files.
-    oldest_data = min(csv_files, key=lambda file: file.stat().st_mtime)
-    youngest_data = max(csv_files, key=lambda file: file.stat().st_mtime)
+    with st.spinner('Carregando dados...'):
+        view = load_view_model(baseline, latest)
+        peers = load_peer_statistics(latest)
 
-    # Load dataframes.
-    oldest_df = pd.read_csv(oldest_data, delimiter=';')
-    youngest_df = pd.read_csv(youngest_data,  delimiter=';')
+    if StreamlitCfg.RENDER_MODE.value == 'tabs':
+        for tab, code in zip(st.tabs(portfolio), portfolio):
+            with tab:
+                show_ticker(code, view, peers)
+    else:
+        show_selected_ticker(portfolio, view, peers)
 
-    # Filter dataframes with portfolio.
-    oldest_filtered_df = oldest_df[oldest_df['Código'].isin(_portfolio)]
-    youngest_filtered_df = youngest_df[youngest_df['Código'].isin(_portfolio)]
 
-    return oldest_filtered_df, youngest_filtered_df
+@st.fragment
+def show_selected_ticker(portfolio: list, view: SnapshotView, peers: PeerStatistics) -> None:
+    """Build only the selected ticker, choosing another one reruns this fragment alone."""
 
+    code = st.radio('Ação', portfolio, horizontal=True, label_visibility='collapsed')
 
-def dasboard_index(portfolio: list) -> None:
-    """Dashboard index page."""
+    show_ticker(code, view, peers)
 
-    # with st.container():
-    #     create_indicator_metrics()
 
-    with st.spinner('Carregando dados...'):
-        oldest_df, youngest_df = load_and_filter_portfolio(portfolio)
+def show_ticker(code: str, view: SnapshotView, peers: PeerStatistics) -> None:
+    """Show the indicators of a ticker, looked up in the view model and peer statistics."""
 
-    tabs = st.tabs(portfolio)
+    values, deltas = view.ticker(code)
+    if values is None:
+        st.warning(f'{code} não encontrado no snapshot.')
+        return
 
-    for tab_index, code in enumerate(portfolio):
-        with tabs[tab_index]:
-            # Filtra os dados da ação correspondente
-            data = youngest_df[youngest_df["Código"] == code].iloc[0]
+    with st.container(border=True):
+        st.subheader(f'{values["Código"]} - {values["Empresa"]}')
 
-            with st.container(border=True):
-                st.subheader(f'{data["Código"]} - {data["Empresa"]}')
+        with st.container(border=True):
+            show_stock_price(values, deltas)
 
-                with st.container(border=True):
-                    show_stock_price(data)
+        with st.expander('Indicadores de Mercado', expanded=True):
+            show_market_indicators(values)
 
-                with st.expander('Indicadores de Mercado', expanded=True):
-                    show_market_indicators(data)
+        with st.expander('Oscilações', expanded=True):
+            show_oscillations(values)
 
-                with st.expander('Oscilações', expanded=True):
-                    show_oscillations(data)
+        with st.expander('Comparação setorial', expanded=False):
+            show_peer_comparison(values, peer_context(peers, code, PEER_METRICS))
 
-                with st.expander('Indicadores de Valuation', expanded=True):
-                    show_valuation_indicators(data)
+        with st.expander('Indicadores de Valuation', expanded=True):
+            show_valuation_indicators(values, deltas)
 
-                with st.expander('Indicadores de Rentabilidade', expanded=True):
-                    show_profitability_indicators(data)
+        with st.expander('Indicadores de Rentabilidade', expanded=True):
+            show_profitability_indicators(values, deltas)
 
-                with st.expander('Indicadores de Endividamento', expanded=True):
-                    show_indebtedness_indicators(data)
+        with st.expander('Indicadores de Endividamento', expanded=True):
+            show_indebtedness_indicators(values, deltas)
 
-                with st.expander('Balanço Patrimonial', expanded=True):
-                    show_balance_sheet(data)
+        with st.expander('Balanço Patrimonial', expanded=True):
+            show_balance_sheet(values, deltas)
 
-                with st.expander('Demonstrativo de Resultados Últimos 12 meses', expanded=True):
-                    show_income_statement_twelve_months(data)
+        with st.expander('Demonstrativo de Resultados Últimos 12 meses', expanded=True):
+            show_income_statement_twelve_months(values, deltas)
 
-                with st.expander('Demonstrativo de Resultados Últimos 3 meses', expanded=True):
-                    show_income_statement_three_months(data)
+        with st.expander('Demonstrativo de Resultados Últimos 3 meses', expanded=True):
+            show_income_statement_three_months(values, deltas)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: screener.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Dashboard screener page, every company of the latest snapshot."""
+
+import time
+
+import pandas as pd
+import streamlit as st
+
+from fundamentus_hub.dashboard.data import load_full_snapshot, resolve_snapshots
+from fundamentus_hub.dashboard.view_model import COLUMN_FORMATS
+from fundamentus_hub.utilities.screener import ScreenerFilter, screen_snapshot
+
+# Metrics filtered when the page opens.
+DEFAULT_FILTERS = ['P/L', 'ROE', 'Dividend Yield', 'Dívida líquida/EBITDA']
+# Columns shown next to the filtered metrics.
+SHOWN_COLUMNS = ['Empresa', 'Setor', 'Cotação']
+
+
+def is_percentage(column: str) -> bool:
+    """Whether a metric is a fraction shown as a percentage."""
+
+    return COLUMN_FORMATS.get(column) == 'percentage'
+
+
+def metric_filter(column: str) -> ScreenerFilter:
+    """Bounds of a metric set by the user, percentages are typed in %."""
+
+    scale = 100 if is_percentage(column) else 1
+    unit = ' (%)' if scale == 100 else ''
+
+    inputs = st.columns(2)
+    minimum = inputs[0].number_input(f'{column} mínimo{unit}', value=None, key=f'min_{column}')
+    maximum = inputs[1].number_input(f'{column} máximo{unit}', value=None, key=f'max_{column}')
+
+    return ScreenerFilter(column,
+                          minimum / scale if minimum is not None else None,
+                          maximum / scale if maximum is not None else None)
+
+
+def show_results(results: pd.DataFrame, columns: list) -> None:
+    """Show the screened companies, percentages scaled to %."""
+
+    table = results[columns].copy()
+    column_config = {}
+
+    for column in columns:
+        if column in SHOWN_COLUMNS[:2]:
+            continue
+
+        if is_percentage(column):
+            table[column] = table[column] * 100
+            column_config[column] = st.column_config.NumberColumn(format='%.2f%%')
+        else:
+            column_config[column] = st.column_config.NumberColumn(format='%.2f')
+
+    st.dataframe(table, column_config=column_config, use_container_width=True)
+
+
+@st.fragment
+def show_screener(snapshot: pd.DataFrame) -> None:
+    """Filters and ranking, changing them reruns this fragment alone."""
+
+    metrics = list(snapshot.select_dtypes('number').columns)
+
+    selected = st.multiselect('Indicadores',
+                              metrics,
+                              default=[metric for metric in DEFAULT_FILTERS if metric in metrics])
+    filters = [metric_filter(metric) for metric in selected]
+
+    options = st.columns(3)
+    sort_by = options[0].selectbox('Ordenar por',
+                                   metrics,
+                                   index=metrics.index(selected[0]) if selected else 0)
+    ascending = options[1].toggle('Crescente', value=True)
+    limit = options[2].number_input('Resultados', min_value=10, max_value=1000, value=50,
+                                    step=10)
+
+    start = time.perf_counter()
+    results = screen_snapshot(snapshot, filters, sort_by, ascending)
+    elapsed = time.perf_counter() - start
+
+    st.caption(f'{len(results)} de {len(snapshot)} empresas, filtradas em {elapsed * 1000:.1f} ms')
+
+    columns = list(dict.fromkeys([*SHOWN_COLUMNS, *selected, sort_by]))
+    show_results(results.head(limit), [column for column in columns if column in snapshot])
+
+
+def dashboard_screener() -> None:
+    """Dashboard screener page."""
+
+    _, latest = resolve_snapshots()
+    if latest is None:
+        st.warning('Nenhum snapshot encontrado, execute o download dos dados primeiro.')
+        return
+
+    with st.spinner('Carregando dados...'):
+        snapshot = load_full_snapshot(latest)
+
+    show_screener(snapshot)
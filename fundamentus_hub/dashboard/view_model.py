@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: view_model.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Display view model of a snapshot, every shown cell formatted once per snapshot."""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from fundamentus_hub.utilities.comparison import SnapshotChanges
+from fundamentus_hub.utilities.humanizer import (MISSING_VALUE, format_changes, format_dates,
+                                                 format_numbers, format_texts, humanize_numbers,
+                                                 to_percentages)
+from fundamentus_hub.utilities.peers import (COUNT_COLUMN, METRIC_COLUMN, PEER_LEVELS, QUARTILES,
+                                             PeerStatistics)
+from fundamentus_hub.utilities.schema import CODE_COLUMN
+
+# Oscillation periods, one row of columns each.
+OSCILLATION_PERIODS = [["dia", "mês", "30 dias", "12 meses"],
+                       ["2024", "2023", "2022", "2021"]]
+
+# Display format of every column shown by the widgets.
+COLUMN_FORMATS = {
+    'Código': 'text', 'Empresa': 'text', 'Cotação': 'monetary', 'Última cotação': 'date',
+    # Market indicators.
+    'Tipo': 'text', 'Setor': 'text', 'Subsetor': 'text', 'Último balanço': 'date',
+    'Nº de ações': 'text', 'Valor de mercado': 'monetary', 'Valor da firma': 'monetary',
+    'Volume negociado por dia': 'monetary',
+    # Oscillations.
+    **{period: 'percentage' for periods in OSCILLATION_PERIODS for period in periods},
+    # Valuation indicators.
+    'P/L': 'number', 'P/VP': 'number', 'P/EBIT': 'number', 'PSR': 'number',
+    'Preço/Ativos': 'number', 'Preço/Ativ circ liq': 'number', 'Dividend Yield': 'percentage',
+    'EV/EBITDA': 'number', 'EV/EBIT': 'number', 'Preço/Capital de giro': 'number',
+    # Profitability indicators.
+    'ROE': 'percentage', 'ROIC': 'percentage', 'EBIT/Ativo': 'number',
+    'Crescimento receita': 'percentage', 'Giro ativos': 'number', 'Margem bruta': 'percentage',
+    'Margem EBIT': 'percentage', 'Margem líquida': 'percentage',
+    # Indebtedness indicators.
+    'Liquidez corrente': 'number', 'Dívida bruta/Patrim': 'number',
+    'Dívida líquida/Patrim': 'number', 'Dívida líquida/EBITDA': 'number', 'PL/Ativos': 'number',
+    # Balance sheet.
+    'Ativo': 'monetary', 'Ativo circulante': 'monetary', 'Disponibilidades': 'monetary',
+    'Dívida bruta': 'monetary', 'Dívida líquida': 'monetary', 'Patrimônio líquido': 'monetary',
+    # Income statement.
+    'Receita líquida_three_months': 'monetary', 'EBIT_three_months': 'monetary',
+    'Lucro líquido_three_months': 'monetary', 'Receita líquida_twelve_months': 'monetary',
+    'EBIT_twelve_months': 'monetary', 'Lucro líquido_twelve_months': 'monetary',
+}
+
+# Vectorized formatter of each display format. The numeric ones take every
+# column of their format at once, the others a single column.
+FORMATTERS = {
+    'text': format_texts,
+    'date': format_dates,
+    'monetary': humanize_numbers,
+    'percentage': to_percentages,
+    'number': format_numbers,
+}
+NUMERIC_FORMATS = ('monetary', 'percentage', 'number')
+
+
+class SnapshotView(NamedTuple):
+    """Formatted values and deltas of every shown column, indexed by ticker code."""
+
+    values: pd.DataFrame
+    deltas: pd.DataFrame
+
+    def ticker(self, code: str) -> tuple:
+        """Formatted values and deltas of a ticker, None if it is not in the snapshot."""
+
+        if code not in self.values.index:
+            return None, None
+
+        deltas = self.deltas.loc[code] if code in self.deltas.index else None
+
+        return self.values.loc[code], deltas
+
+
+def _format_block(formatter, block: pd.DataFrame) -> pd.DataFrame:
+    """Format every cell of numeric columns in a single call."""
+
+    numbers = block.to_numpy(dtype='float64', na_value=np.nan)
+    strings = formatter(numbers.ravel()).reshape(numbers.shape)
+
+    return pd.DataFrame(strings, index=block.index, columns=block.columns)
+
+
+def build_view_model(snapshot: pd.DataFrame, changes: SnapshotChanges = None) -> SnapshotView:
+    """Format the shown columns of every ticker of a snapshot.
+
+    Missing values are shown as '-'; missing changes, and the ones that round
+    to 0.00%, give no delta.
+    """
+
+    snapshot = snapshot.set_index(snapshot[CODE_COLUMN])
+
+    formatted = {}
+    for display_format in FORMATTERS:
+        columns = [column for column, column_format in COLUMN_FORMATS.items()
+                   if column_format == display_format and column in snapshot.columns]
+
+        if display_format in NUMERIC_FORMATS:
+            formatted.update(_format_block(FORMATTERS[display_format], snapshot[columns]))
+        else:
+            formatted.update({column: FORMATTERS[display_format](snapshot[column])
+                              for column in columns})
+
+    values = pd.DataFrame({column: formatted.get(column, MISSING_VALUE)
+                           for column in COLUMN_FORMATS},
+                          index=snapshot.index)
+
+    deltas = pd.DataFrame(index=pd.Index([], name=CODE_COLUMN))
+    if changes is not None:
+        # An unchanged metric would otherwise show a green '+0.00%'.
+        changed = changes.percentage.mul(100).round(2).ne(0)
+        deltas = _format_block(format_changes, changes.percentage.where(changed))
+
+    return SnapshotView(values, deltas)
+
+
+def build_peer_view(statistics: PeerStatistics) -> PeerStatistics:
+    """Format the group statistics and sector ranks once per snapshot.
+
+    The quartiles follow the display format of their metric, numeric columns
+    without a numeric display format as plain numbers; the widgets only
+    select rows.
+    """
+
+    groups = statistics.groups
+    quartiles = list(QUARTILES)
+
+    formats = np.array([COLUMN_FORMATS.get(metric) if COLUMN_FORMATS.get(metric) in NUMERIC_FORMATS
+                        else 'number'
+                        for metric in groups.index.get_level_values(METRIC_COLUMN)])
+
+    formatted_groups = pd.DataFrame(MISSING_VALUE, index=groups.index, columns=groups.columns,
+                                    dtype=object)
+    formatted_groups[COUNT_COLUMN] = groups[COUNT_COLUMN].astype('Int64').astype(str)
+    for display_format in NUMERIC_FORMATS:
+        rows = formats == display_format
+        formatted_groups.loc[rows, quartiles] = _format_block(
+            FORMATTERS[display_format], groups.loc[rows, quartiles]).to_numpy()
+
+    ranks = statistics.ranks
+    metrics = ranks.columns.drop(PEER_LEVELS)
+    formatted_ranks = pd.concat([ranks[PEER_LEVELS], _format_block(to_percentages, ranks[metrics])],
+                                axis=1)
+
+    return PeerStatistics(formatted_groups, formatted_ranks)
@@ -16,27 +16,32 @@
 #  License: MIT
 #  ------------------------------------------------------------------------------
 
-import pandas as pd
 import streamlit as st
 
-from fundamentus_hub.downloader.requester import SGSRequester
+from fundamentus_hub.downloader.series import SGSSeriesStore
 from fundamentus_hub.utilities.configuration import SGSAPIConfiguration as SGSCfg
 from fundamentus_hub.utilities.humanizer import format_metrics_value
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def extract_sgs_value(data) -> pd.DataFrame:
-    """Extract data from the SGS API and return the last value."""
+def load_indicator_values() -> dict:
+    """Refresh the local SGS series and return their last values."""
 
-    return pd.DataFrame(data).set_index('data')
+    store = SGSSeriesStore()
+    store.refresh()
+
+    values = {}
+    for name in store.indicators():
+        value = store.latest(name)
+        if value is not None:
+            values[name] = value
+
+    return values
 
 
 def create_indicator_metrics():
     """Create the indicator metrics."""
 
-    # Initialize the requester interface.
-    requester = SGSRequester()
-
     st.subheader('Indicadores Econômicos')
 
     with st.spinner('Acessando o Sistema Gerenciador de Séries Temporais do Banco Central...'):
@@ -44,6 +49,12 @@ def create_indicator_metrics():
         indicators = [indicator for indicator in SGSCfg if isinstance(indicator.value,
                                                                       dict)]
 
+        # Busca todas as séries de uma vez, respeitando o prazo configurado
+        values = load_indicator_values()
+        if len(values) < len(indicators):
+            # Não mantém em cache um resultado incompleto
+            load_indicator_values.clear()
+
         # Determinar o número de colunas por linha (divide por 2)
         num_indicators = len(indicators)
         num_columns = (num_indicators + 1) // 2  # Número de colunas por linha
@@ -53,11 +64,9 @@ def create_indicator_metrics():
 
         # Distribui os indicadores entre as colunas
         for index, indicator in enumerate(indicators):
-            response = extract_sgs_value(requester.make_request(indicator.value['url']))
-            raw_value = float(response['valor'].iloc[-1])  # pylint: disable=unsubscriptable-object
-            formatted_value = format_metrics_value(raw_value,
-                                                   indicator.value.get('output_format',
-                                                                       'default'))
+            raw_value = values.get(indicator.name)
+            formatted_value = '—' if raw_value is None else format_metrics_value(
+                raw_value, indicator.value.get('output_format', 'default'))
 
             with columns[index]:
                 st.metric(value=formatted_value,
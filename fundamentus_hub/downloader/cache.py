@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: cache.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""On-disk response cache for the stock fetcher."""
+
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from fundamentus_hub.downloader.interfaces.handler import StockFetcherInterface
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+
+
+# pylint: disable=too-many-instance-attributes
+class CachedStockFetcher(StockFetcherInterface):
+    """Stock Fetcher decorator that caches the responses on disk, keyed by ticket.
+
+    Entries expire after `ttl` seconds, by default together with the HTTP
+    cache of pyfundamentus; unlike it, a hit here also skips the parsing.
+    When the cache grows over `max_size` bytes, the least recently used
+    entries are evicted, along with the temporary files of interrupted writes.
+    """
+
+    # Age after which a temporary file is left over by an interrupted write.
+    STALE_TEMPORARY_AGE = 60 * 60
+
+    def __init__(self,
+                 fetcher: StockFetcherInterface,
+                 cache_path: str = DownloadCfg.CACHE_PATH.value,
+                 ttl: int = DownloadCfg.CACHE_TTL.value,
+                 max_size: int = DownloadCfg.CACHE_MAX_SIZE.value) -> None:
+        self.__fetcher = fetcher
+        self.__path = Path(cache_path)
+        self.__ttl = ttl
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.__path.mkdir(parents=True, exist_ok=True)
+        self.__sweep()
+        self.__size = sum(entry.stat().st_size for entry in self.__path.glob('*.pkl'))
+
+    def __entry_path(self, ticket: str) -> Path:
+        """Path of the cache entry of a ticket."""
+
+        return self.__path / f'{ticket}.pkl'
+
+    def __discard(self, entry_path: Path) -> None:
+        """Remove a cache entry."""
+
+        try:
+            size = entry_path.stat().st_size
+            entry_path.unlink()
+        except FileNotFoundError:
+            return
+
+        with self.__lock:
+            self.__size -= size
+
+    def __read(self, ticket: str):
+        """Read a fresh cache entry, if any."""
+
+        entry_path = self.__entry_path(ticket)
+
+        try:
+            with open(entry_path, 'rb') as file:
+                fetched_at, response = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, ValueError, TypeError,
+                AttributeError, ImportError):
+            # Entries pickled against another pyfundamentus release may not load either.
+            logger.warning(f'Discarding unreadable cache entry {entry_path}')
+            self.__discard(entry_path)
+            return None
+
+        if time.time() - fetched_at > self.__ttl:
+            self.__discard(entry_path)
+            return None
+
+        # Mark the entry as recently used.
+        os.utime(entry_path)
+
+        return response
+
+    def __write(self, ticket: str, response) -> None:
+        """Write a cache entry atomically."""
+
+        entry_path = self.__entry_path(ticket)
+        temporary_path = entry_path.with_suffix(f'.{threading.get_ident()}.tmp')
+
+        with open(temporary_path, 'wb') as file:
+            pickle.dump((time.time(), response), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        previous_size = entry_path.stat().st_size if entry_path.exists() else 0
+        os.replace(temporary_path, entry_path)
+
+        with self.__lock:
+            self.__size += entry_path.stat().st_size - previous_size
+            oversized = self.__size > self.__max_size
+
+        if oversized:
+            self.__evict()
+
+    def __sweep(self) -> None:
+        """Remove the temporary files left over by interrupted writes."""
+
+        stale = time.time() - self.STALE_TEMPORARY_AGE
+
+        for temporary_path in self.__path.glob('*.tmp'):
+            try:
+                if temporary_path.stat().st_mtime < stale:
+                    temporary_path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def __evict(self) -> None:
+        """Evict the least recently used entries until the cache fits max_size."""
+
+        self.__sweep()
+
+        entries = []
+        for entry_path in self.__path.glob('*.pkl'):
+            try:
+                entries.append((entry_path.stat().st_mtime, entry_path))
+            except FileNotFoundError:
+                continue
+
+        for _, entry_path in sorted(entries):
+            with self.__lock:
+                if self.__size <= self.__max_size:
+                    break
+
+            self.__discard(entry_path)
+
+    def get_all_tickets(self) -> list:
+        """Get all tickets from the wrapped fetcher"""
+
+        return self.__fetcher.get_all_tickets()
+
+    def get_data(self, ticket: str) -> list:
+        """Get data from the cache, falling back to the wrapped fetcher"""
+
+        response = self.__read(ticket)
+
+        with self.__lock:
+            if response is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if response is not None:
+            return response
+
+        response = self.__fetcher.get_data(ticket)
+
+        if response is not None:
+            self.__write(ticket, response)
+
+        return response
+
+    def report(self) -> None:
+        """Log the cache counters."""
+
+        requests = self.hits + self.misses
+        ratio = self.hits / requests if requests else 0.0
+
+        logger.info(f'Response cache: {self.hits} hits, {self.misses} misses '
+                    f'({ratio:.1%} hit ratio), {self.__size / 1_048_576:.1f} MiB on disk')
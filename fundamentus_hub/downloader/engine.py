@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: engine.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Fetch engines used by the DownloadHandler."""
+
+import asyncio
+import concurrent.futures
+import time
+from typing import Any, Callable
+
+from loguru import logger
+
+from fundamentus_hub.downloader.interfaces.engine import FetchEngineInterface
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+
+
+class FetchStatistics:
+    """Throughput statistics of a fetch run."""
+
+    def __init__(self, engine: str) -> None:
+        self.engine = engine
+        self.succeeded = 0
+        self.failed = 0
+        self.elapsed = 0.0
+        self.__started_at = time.perf_counter()
+
+    @property
+    def total(self) -> int:
+        """Number of tickets processed."""
+
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Processed tickets per second."""
+
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def add(self, response: Any, error: Exception = None) -> None:
+        """Account for a completed ticket."""
+
+        if response is not None and error is None:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def stop(self) -> None:
+        """Stop the run clock."""
+
+        self.elapsed = time.perf_counter() - self.__started_at
+
+    def report(self) -> None:
+        """Log the throughput of the run."""
+
+        logger.info(f'[{self.engine}] {self.total} tickets in {self.elapsed:.2f}s '
+                    f'({self.succeeded} ok, {self.failed} errors) - '
+                    f'{self.throughput:.2f} tickets/s')
+
+
+# pylint: disable=too-few-public-methods
+class ThreadFetchEngine(FetchEngineInterface):
+    """Fetch tickets with a ThreadPoolExecutor."""
+
+    def __init__(self, max_workers: int = None) -> None:
+        self.__max_workers = max_workers
+
+    def fetch(self,
+              portfolio: list,
+              fetch_function: Callable[[str], Any],
+              on_result: Callable[[str, Any, Exception], None]) -> FetchStatistics:
+        """Create a ThreadPoolExecutor to get data from pyfundamentus API"""
+
+        statistics = FetchStatistics('thread')
+
+        # Create a ThreadPoolExecutor
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            # Submit the tasks to the executor
+            futures = {executor.submit(fetch_function, ticket): ticket for ticket in portfolio}
+
+            # Retrieve the results as they become available
+            for future in concurrent.futures.as_completed(futures):
+                response, error = None, future.exception()
+                if error is None:
+                    response = future.result()
+
+                statistics.add(response, error)
+                on_result(futures[future], response, error)
+
+        statistics.stop()
+
+        return statistics
+
+
+# pylint: disable=too-few-public-methods
+class AsyncFetchEngine(FetchEngineInterface):
+    """Fetch tickets with asyncio, bounding concurrency.
+
+    pyfundamentus is a blocking client, so each request still runs on a worker
+    thread; asyncio schedules them under the concurrency ceiling. The
+    requests-per-second budget is taken by the fetcher at the network call,
+    see RateLimitedStockFetcher.
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.__max_concurrency = max_concurrency
+
+    def fetch(self,
+              portfolio: list,
+              fetch_function: Callable[[str], Any],
+              on_result: Callable[[str, Any, Exception], None]) -> FetchStatistics:
+        """Run the asyncio event loop until every ticket is fetched."""
+
+        statistics = FetchStatistics('async')
+
+        asyncio.run(self.__fetch_all(portfolio, fetch_function, on_result, statistics))
+
+        statistics.stop()
+
+        return statistics
+
+    async def __fetch_all(self,
+                          portfolio: list,
+                          fetch_function: Callable[[str], Any],
+                          on_result: Callable[[str, Any, Exception], None],
+                          statistics: FetchStatistics) -> None:
+        """Schedule every ticket and hand over the results as they complete."""
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.__max_concurrency)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.__max_concurrency) as executor:
+
+            async def fetch_one(ticket: str) -> tuple:
+                async with semaphore:
+                    try:
+                        response = await loop.run_in_executor(executor, fetch_function, ticket)
+                        return ticket, response, None
+                    except Exception as error:  # pylint: disable=broad-except
+                        return ticket, None, error
+
+            for next_result in asyncio.as_completed([fetch_one(ticket) for ticket in portfolio]):
+                ticket, response, error = await next_result
+                statistics.add(response, error)
+                on_result(ticket, response, error)
+
+
+def create_fetch_engine(engine: str, max_concurrency: int = None) -> FetchEngineInterface:
+    """Create the fetch engine selected by name."""
+
+    if engine == 'async':
+        if max_concurrency is None:
+            max_concurrency = DownloadCfg.MAX_CONCURRENCY.value
+
+        return AsyncFetchEngine(max_concurrency)
+
+    if engine == 'thread':
+        return ThreadFetchEngine(max_concurrency)
+
+    raise ValueError(f'Unknown fetch engine: {engine}')
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: flattening.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Flattening plan of the pyfundamentus information into table columns."""
+
+import numpy as np
+import pandas as pd
+
+
+class FlatteningPlan:
+    """Fixed column layout and key mapping of the flattened information.
+
+    The layout of each category section is compiled once into a tuple of
+    (section, title, column index) entries. Flattening a ticket then looks
+    the items up directly and writes their values at the column index, with
+    no key building or dict merging. Sections whose shape or titles differ
+    from every compiled layout (e.g. the balance sheet of banks) get a
+    layout of their own; new columns are appended at the end.
+    """
+
+    def __init__(self, categories: list) -> None:
+        self.__categories = categories
+        self.__layouts = {category: [] for category in categories}
+        self.__column_index = {}
+
+        self.columns = []
+
+    def __column(self, column: str) -> int:
+        """Find the index of a column, adding it if it is new."""
+
+        index = self.__column_index.get(column)
+
+        if index is None:
+            index = len(self.columns)
+            self.columns.append(column)
+            self.__column_index[column] = index
+
+        return index
+
+    def __compile(self, data_section: dict) -> tuple:
+        """Compile the layout of a category section."""
+
+        entries = []
+        for section_name, item in data_section.items():
+            if isinstance(item, dict):
+                sub_entries = tuple((key,
+                                     sub_item.title,
+                                     self.__column(f'{sub_item.title}_{section_name}'))
+                                    for key, sub_item in item.items())
+                entries.append((section_name, None, None, sub_entries))
+            else:
+                entries.append((section_name, item.title, self.__column(item.title), None))
+
+        return len(data_section), tuple(entries)
+
+    @staticmethod
+    def __fill(layout: tuple, data_section: dict, values: list, written: list) -> bool:
+        """Write the values of a section following a layout, if it matches.
+
+        The index and previous value of every written cell go to `written`,
+        so a layout that stops matching halfway can be undone.
+        """
+
+        count, entries = layout
+        if len(data_section) != count:
+            return False
+
+        try:
+            for section_name, title, index, sub_entries in entries:
+                item = data_section[section_name]
+
+                if sub_entries is None:
+                    if item.title != title:
+                        return False
+                    written.append((index, values[index]))
+                    values[index] = item.value
+                    continue
+
+                if len(item) != len(sub_entries):
+                    return False
+
+                for key, sub_title, sub_index in sub_entries:
+                    sub_item = item[key]
+                    if sub_item.title != sub_title:
+                        return False
+                    written.append((sub_index, values[sub_index]))
+                    values[sub_index] = sub_item.value
+        except (KeyError, AttributeError, TypeError):
+            return False
+
+        return True
+
+    @staticmethod
+    def __undo(written: list, values: list) -> None:
+        """Restore the cells written by a layout that did not match."""
+
+        for index, value in reversed(written):
+            values[index] = value
+
+    def flatten(self, transformed_information: dict) -> list:
+        """Flatten the information of a ticket into values aligned with the columns."""
+
+        values = [None] * len(self.columns)
+
+        for category in self.__categories:
+            data_section = transformed_information.get(category)
+            if not data_section:
+                continue
+
+            layouts = self.__layouts[category]
+
+            for layout in layouts:
+                written = []
+                if self.__fill(layout, data_section, values, written):
+                    break
+                self.__undo(written, values)
+            else:
+                layout = self.__compile(data_section)
+                layouts.append(layout)
+
+                values.extend([None] * (len(self.columns) - len(values)))
+                self.__fill(layout, data_section, values, [])
+
+        return values
+
+    def align(self, row: dict) -> list:
+        """Align a row keyed by column name with the columns of the plan."""
+
+        for column in row:
+            self.__column(column)
+
+        return [row.get(column) for column in self.columns]
+
+    def to_dict(self, values: list) -> dict:
+        """Key flattened values by column name."""
+
+        return dict(zip(self.columns, values))
+
+
+class ColumnarBuffer:
+    """Preallocated column arrays filled one row at a time."""
+
+    def __init__(self, capacity: int) -> None:
+        self.__capacity = max(capacity, 1)
+        self.__arrays = []
+        self.__rows = 0
+
+    def __len__(self) -> int:
+        return self.__rows
+
+    def __new_array(self) -> np.ndarray:
+        """Allocate an empty column array."""
+
+        return np.full(self.__capacity, None, dtype=object)
+
+    def append(self, values: list) -> None:
+        """Store the values of a row in the column arrays."""
+
+        if self.__rows == self.__capacity:
+            self.__capacity *= 2
+            self.__arrays = [np.concatenate([array, np.full(self.__capacity - len(array),
+                                                            None,
+                                                            dtype=object)])
+                             for array in self.__arrays]
+
+        while len(self.__arrays) < len(values):
+            self.__arrays.append(self.__new_array())
+
+        row = self.__rows
+        for array, value in zip(self.__arrays, values):
+            array[row] = value
+
+        self.__rows += 1
+
+    def to_data_frame(self, columns: list) -> pd.DataFrame:
+        """Build the DataFrame straight from the column arrays."""
+
+        arrays = {}
+        for index, column in enumerate(columns):
+            if index < len(self.__arrays):
+                arrays[column] = self.__arrays[index][:self.__rows]
+            else:
+                arrays[column] = np.full(self.__rows, None, dtype=object)
+
+        return pd.DataFrame(arrays, columns=columns, copy=False)
@@ -16,9 +16,10 @@
 #  License: MIT
 #  ------------------------------------------------------------------------------
 
-import concurrent.futures
+import csv
 import datetime
-import pickle
+from pathlib import Path
+from typing import Callable, Iterator
 
 import pandas as pd
 from fundamentus import Pipeline
@@ -26,10 +27,21 @@ from fundamentus.exceptions.extract_exception import ExtractException
 from fundamentus.exceptions.http_request_error import HttpRequestError
 from loguru import logger
 
+from fundamentus_hub.downloader.engine import ThreadFetchEngine
+from fundamentus_hub.downloader.flattening import ColumnarBuffer, FlatteningPlan
+from fundamentus_hub.downloader.interfaces.engine import FetchEngineInterface
+from fundamentus_hub.downloader.journal import CheckpointJournal
+from fundamentus_hub.downloader.resilience import TRANSIENT, FailureRecord
 from fundamentus_hub.downloader.interfaces.handler import (DataPersisterInterface,
                                                            DataProcessorInterface,
-                                                           StockFetcherInterface)
+                                                           StockFetcherInterface,
+                                                           StreamingDataPersisterInterface)
+from fundamentus_hub.storage.delta import DeltaSnapshotStore
+from fundamentus_hub.storage.manifest import SnapshotManifest
+from fundamentus_hub.storage.snapshots import (CSV_CHUNK_ROWS, SnapshotStore, compression_suffix,
+                                               write_csv_batches, write_snapshot)
 from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import enforce_schema
 
 
 class StockFetcher(StockFetcherInterface):
@@ -44,7 +56,11 @@ class StockFetcher(StockFetcherInterface):
         return [ticket['code'] for ticket in response.transformed_information]
 
     def get_data(self, ticket: str) -> list:
-        """Get data from pyfundamentus API"""
+        """Get data from pyfundamentus API
+
+        Raises:
+            HttpRequestError, ExtractException: If the request fails.
+        """
 
         # Get data from pyfundamentus API.
         try:
@@ -52,11 +68,11 @@ class StockFetcher(StockFetcherInterface):
             fundamentus_response = Pipeline(ticket).get_all_information()
 
             return fundamentus_response
-        except HttpRequestError as error:
+        except (HttpRequestError, ExtractException) as error:
             logger.error(f'Error getting data from {ticket}')
             logger.error(f'Error: {error}')
 
-            return None
+            raise
 
 
 # pylint: disable=too-few-public-methods
@@ -64,19 +80,33 @@ class DataProcessor(DataProcessorInterface):
     """Data Processor class"""
 
     def __init__(self, categories: list) -> None:
-        self.__categories = categories
+        self.__plan = FlatteningPlan(categories)
 
-    def process_information(self, ticket_data) -> dict:
-        """Process the information extracted from pyfundamentus API"""
+    @property
+    def columns(self) -> list:
+        """Columns of the flattened information, in order."""
+
+        return self.__plan.columns
+
+    def flatten(self, ticket_data) -> list:
+        """Flatten the information of a ticket into values aligned with columns"""
 
-        temporal_data = {}
+        return self.__plan.flatten(ticket_data.transformed_information)
 
-        # Extract information from each category.
-        for category in self.__categories:
-            data_section = ticket_data.transformed_information.get(category, {})
-            temporal_data.update(self.extract_information(data_section))
+    def align(self, data: dict) -> list:
+        """Align processed information keyed by column with columns"""
+
+        return self.__plan.align(data)
+
+    def to_dict(self, values: list) -> dict:
+        """Key flattened values by column"""
+
+        return self.__plan.to_dict(values)
+
+    def process_information(self, ticket_data) -> dict:
+        """Process the information extracted from pyfundamentus API"""
 
-        return temporal_data
+        return self.to_dict(self.flatten(ticket_data))
 
     def extract_information(self, data_section: dict) -> dict:
         """Extract information from data_section and store it in temporal_data"""
@@ -104,18 +134,118 @@ class DataPersister(DataPersisterInterface):
                                  file_format: str = 'csv') -> None:
         """Persist data to a file"""
 
-        today = datetime.date.today().strftime("%d-%m-%Y")
+        if file_format == 'store':
+            SnapshotStore().write(data_frame)
+            return
+
+        if file_format == 'delta':
+            DeltaSnapshotStore().write(data_frame)
+            return
+
+        today = datetime.date.today()
+        compression = DownloadCfg.DATA_COMPRESSION.value.get(file_format)
+        path = Path(f'{DownloadCfg.DATA_PATH.value}{file_name}_{today.strftime("%d-%m-%Y")}'
+                    f'.{file_format}{compression_suffix(file_format, compression)}')
+
+        logger.info(f'Persisting data to {path.name}')
+
+        write_snapshot(data_frame, path, compression)
+
+        SnapshotManifest().record(today, path, file_format, len(data_frame))
+
+
+class StreamingDataPersister(DataPersister, StreamingDataPersisterInterface):
+    """Data Persister that appends each row to a staging file as soon as it is processed
+
+    Rows are staged in a plain CSV file. Once it is complete, the staged rows
+    are typed by the schema registry and published in batches: as a CSV file
+    written through a compressed handle, or as row groups of the snapshot
+    store. Only one batch is in memory at a time.
+    """
 
-        logger.info(f'Persisting data to {file_name}_{today}.{file_format}')
+    def __init__(self) -> None:
+        self.__file_format = None
+        self.__path = None
+        self.__partial_path = None
+        self.__file = None
+        self.__writer = None
+        self.__fieldnames = []
+        self.__rows = 0
 
-        if file_format == 'pkl':
-            with open(f'{DownloadCfg.DATA_PATH.value}{file_name}_{today}.pkl', 'wb') as file:
-                pickle.dump(data_frame, file)
-        elif file_format == 'csv':
-            data_frame.to_csv(f'{DownloadCfg.DATA_PATH.value}{file_name}_{today}.csv',
-                              index=False,
-                              sep=';',
-                              encoding='utf-8')
+    def open(self, file_name: str, file_format: str = 'csv') -> None:
+        """Open a partial output file for the rows of the day"""
+
+        if file_format not in ('csv', 'store', 'delta'):
+            raise ValueError(f'Streaming persistence does not support {file_format} files')
+
+        self.__file_format = file_format
+        today = datetime.date.today().strftime("%d-%m-%Y")
+
+        compression = DownloadCfg.DATA_COMPRESSION.value['csv']
+        self.__path = (Path(DownloadCfg.DATA_PATH.value) /
+                       f'{file_name}_{today}.csv{compression_suffix("csv", compression)}')
+        self.__partial_path = self.__path.with_name(f'{file_name}_{today}.csv.partial')
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f'Streaming data to {self.__partial_path}')
+
+        # pylint: disable=consider-using-with
+        self.__file = open(self.__partial_path, 'w', newline='', encoding='utf-8')
+        self.__writer = csv.writer(self.__file, delimiter=';')
+        self.__fieldnames = []
+        self.__rows = 0
+
+    def write_row(self, row: dict) -> None:
+        """Append a processed row to the output file"""
+
+        known_fields = set(self.__fieldnames)
+        # New columns go to the end, so the rows already written stay valid.
+        self.__fieldnames.extend(field for field in row if field not in known_fields)
+
+        self.__writer.writerow([row.get(field) for field in self.__fieldnames])
+        self.__file.flush()
+        self.__rows += 1
+
+    def close(self) -> None:
+        """Publish the staged rows in the output format and remove the staging file"""
+
+        self.__file.close()
+
+        if not self.__rows:
+            logger.warning('No rows to persist')
+            self.__partial_path.unlink()
+            return
+
+        if self.__file_format == 'store':
+            SnapshotStore().write_batches(self.__read_batches())
+        elif self.__file_format == 'delta':
+            # A delta is the difference between two whole snapshots.
+            DeltaSnapshotStore().write(pd.concat(self.__read_batches(), ignore_index=True))
+        else:
+            write_csv_batches(self.__read_batches(),
+                              self.__path,
+                              DownloadCfg.DATA_COMPRESSION.value['csv'])
+            SnapshotManifest().record(datetime.date.today(), self.__path, 'csv', self.__rows)
+
+        self.__partial_path.unlink()
+
+        logger.info(f'Persisted {self.__rows} streamed rows as {self.__file_format}')
+
+    def __read_batches(self) -> Iterator[pd.DataFrame]:
+        """Read the staged rows in batches typed by the schema registry"""
+
+        # The staged file has no header, the columns are only all known at the end;
+        # rows written before a column showed up are shorter and get NaN.
+        with pd.read_csv(self.__partial_path,
+                         delimiter=';',
+                         header=None,
+                         names=self.__fieldnames,
+                         dtype=str,
+                         na_values=[''],
+                         keep_default_na=False,
+                         chunksize=CSV_CHUNK_ROWS) as reader:
+            for batch in reader:
+                yield enforce_schema(batch)
 
 
 # pylint: disable=too-few-public-methods
@@ -125,64 +255,109 @@ class DownloadHandler:
     def __init__(self,
                  fetcher: StockFetcher,
                  processor: DataProcessor,
-                 persister: DataPersister) -> None:
+                 persister: DataPersister,
+                 engine: FetchEngineInterface = None) -> None:
         self.__fetcher = fetcher
         self.__processor = processor
         self.__persister = persister
+        self.__engine = engine if engine is not None else ThreadFetchEngine()
 
     def __log_error(self, tickets_error: list) -> None:
         """Log tickets with errors."""
 
-        for ticket in tickets_error:
-            logger.error(f'Error getting data from {ticket}')
+        for failure in tickets_error:
+            logger.error(f'Error getting data from {failure.ticket}: {failure.error_class} '
+                         f'({failure.kind}) after {failure.attempts} attempts - {failure.message}')
 
-    def __fetch_data_concurrently(self,
-                                  portfolio: list) -> tuple:
-        """Create a ThreadPoolExecutor to get data from pyfundamentus API"""
+        if tickets_error:
+            transient = sum(failure.kind == TRANSIENT for failure in tickets_error)
+            logger.warning(f'{len(tickets_error)} tickets failed: {transient} transient, '
+                           f'{len(tickets_error) - transient} permanent')
 
-        if not portfolio:
-            portfolio = self.__fetcher.get_all_tickets()
+    def __fetch_and_process(self,
+                            portfolio: list,
+                            journal: CheckpointJournal,
+                            on_processed: Callable[[list], None]) -> list:
+        """Fetch data from pyfundamentus API with the configured engine
+
+        Each response is flattened, checkpointed and handed to on_processed as
+        soon as it completes, tickets already in the journal are restored
+        instead of fetched.
+        """
+
+        pending = journal.pending(portfolio)
+
+        # Restore the tickets processed by a previous run of the day.
+        restored = 0
+        for data in journal.rows(portfolio):
+            on_processed(self.__processor.align(data))
+            restored += 1
+
+        if restored:
+            logger.info(f'Restored {restored} tickets from {journal.path}')
 
-        tickets_data = []
         tickets_error = []
 
-        # Create a ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # Submit the tasks to the executor
-            futures = [executor.submit(self.__fetcher.get_data, ticket) for ticket in portfolio]
-
-            # Retrieve the results as they become available
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    # Raises exception if an error occurred.
-                    response = future.result()
-                    if response is not None:
-                        tickets_data.append(response)
-                    else:
-                        tickets_error.append(response)
-                except ExtractException:
-                    continue
-
-        return tickets_data, tickets_error
+        def on_result(ticket: str, response, error: Exception) -> None:
+            if error is not None or response is None:
+                failure = FailureRecord.from_error(ticket, error)
+                journal.record_failure(ticket, failure._asdict())
+                tickets_error.append(failure)
+                return
+
+            values = self.__processor.flatten(response)
+            journal.record_success(ticket, self.__processor.to_dict(values))
+            on_processed(values)
+
+        statistics = self.__engine.fetch(pending, self.__fetcher.get_data, on_result)
+        statistics.report()
+
+        return tickets_error
 
     def run(self,
             portfolio: list,
             output_file: str,
             file_format: str = 'csv',
-            show_tickets_error: bool = 'True') -> None:
+            show_tickets_error: bool = 'True',
+            resume: bool = True) -> None:
         """Run the download handler"""
 
-        # Step 1: Fetch data from pyfundamentus API.
-        fundamentus_data, tickets_error = self.__fetch_data_concurrently(portfolio)
+        if not portfolio:
+            portfolio = self.__fetcher.get_all_tickets()
+
+        journal = CheckpointJournal(output_file)
+        journal.remove_stale()
+        if not resume:
+            journal.reset()
+
+        if isinstance(self.__persister, StreamingDataPersisterInterface):
+            # Rows go straight to the output file.
+            self.__persister.open(output_file, file_format)
+
+            tickets_error = self.__fetch_and_process(
+                portfolio,
+                journal,
+                lambda values: self.__persister.write_row(self.__processor.to_dict(values)))
+
+            self.__persister.close()
+        else:
+            # Step 1 and 2: Fetch and flatten data into preallocated columns.
+            buffer = ColumnarBuffer(len(portfolio))
+            tickets_error = self.__fetch_and_process(portfolio, journal, buffer.append)
+
+            # Step 3: Persist the data.
+            data_frame = enforce_schema(buffer.to_data_frame(self.__processor.columns),
+                                        report=True)
+            self.__persister.persist_fundamentus_data(data_frame,
+                                                      output_file,
+                                                      file_format)
+
+        # The output holds every processed ticket, the journal is only kept,
+        # compacted, so a re-run of the day retries the failed tickets.
+        if tickets_error:
+            journal.compact()
+        else:
+            journal.reset()
 
         if show_tickets_error:
             self.__log_error(tickets_error)
-
-        # Step 2: Process the data.
-        processed_data = [self.__processor.process_information(data) for data in fundamentus_data]
-
-        # Step 3: Persist the data.
-        data_frame = pd.DataFrame(processed_data)
-        self.__persister.persist_fundamentus_data(data_frame,
-                                                  output_file,
-                                                  file_format)
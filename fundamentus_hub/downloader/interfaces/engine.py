@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: engine.py
+#  Version: 0.0.1
+#
+#  Summary: Python Fundamentus
+#           Python Fundamentus is a Python API that allows you to quickly
+#           access the main fundamental indicators of the main stocks
+#           in the Brazilian market.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+"""Interfaces for the fetch engine module."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+
+# pylint: disable=too-few-public-methods
+class FetchEngineInterface(ABC):
+    """Represents a fetch engine."""
+
+    @abstractmethod
+    def fetch(self,
+              portfolio: list,
+              fetch_function: Callable[[str], Any],
+              on_result: Callable[[str, Any, Exception], None]):
+        """Fetch every ticket of the portfolio, calling on_result as each one completes."""
+
+        raise NotImplementedError("You should implement this method.")
@@ -66,3 +66,25 @@ class DataPersisterInterface(ABC):
         """Represents a data persister."""
 
         raise NotImplementedError("You should implement this method.")
+
+
+class StreamingDataPersisterInterface(ABC):
+    """Represents a data persister that writes the rows as they are processed."""
+
+    @abstractmethod
+    def open(self, file_name: str, file_format: str) -> None:
+        """Open the output file."""
+
+        raise NotImplementedError("You should implement this method.")
+
+    @abstractmethod
+    def write_row(self, row: Dict) -> None:
+        """Append a processed row to the output file."""
+
+        raise NotImplementedError("You should implement this method.")
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the output file."""
+
+        raise NotImplementedError("You should implement this method.")
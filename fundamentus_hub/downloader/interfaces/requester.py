@@ -27,7 +27,13 @@ class RequesterInterface(ABC):
     """Represents a complete HTTP request."""
 
     @abstractmethod
-    def make_request(self, url: str) -> Dict:
+    def make_request(self, url: str, timeout: float = None) -> Dict:
         """Make request to the url and return the response."""
 
         raise NotImplementedError("You should implement this method.")
+
+    @abstractmethod
+    def make_requests(self, urls: Dict[str, str], deadline: float) -> Dict:
+        """Make the requests concurrently and return the responses keyed by name."""
+
+        raise NotImplementedError("You should implement this method.")
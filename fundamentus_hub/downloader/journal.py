@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: journal.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Append-only checkpoint journal of a download run."""
+
+import datetime
+import json
+import os
+import threading
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator
+
+from loguru import logger
+
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+
+
+def _encode_value(value):
+    """Encode values json does not know about."""
+
+    if isinstance(value, Decimal):
+        return float(value)
+
+    return str(value)
+
+
+class CheckpointJournal:
+    """Records every processed ticket of the day as one JSON line.
+
+    The last entry of a ticket wins, so a re-run only needs the tickets
+    that are missing or whose last entry is a failure.
+    """
+
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, file_name: str, journal_date: datetime.date = None) -> None:
+        journal_date = journal_date or datetime.date.today()
+
+        self.__file_name = file_name
+        self.__path = (Path(DownloadCfg.DATA_PATH.value) /
+                       f'{file_name}_{journal_date.strftime("%d-%m-%Y")}.journal')
+        # Only the status and the line of the last entry of each ticket are
+        # kept in memory; the rows stay on disk.
+        self.__status = {}
+        self.__last_line = {}
+        self.__lines = 0
+        self.__lock = threading.Lock()
+
+        self.__load()
+
+    @property
+    def path(self) -> Path:
+        """Path of the journal file."""
+
+        return self.__path
+
+    @property
+    def completed(self) -> set:
+        """Tickets already processed successfully."""
+
+        return {ticket for ticket, status in self.__status.items() if status == self.DONE}
+
+    def __load(self) -> None:
+        """Replay the journal file, if any."""
+
+        if not self.__path.exists():
+            return
+
+        truncated = False
+        with open(self.__path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file):
+                self.__lines = line_number + 1
+                truncated = not line.endswith('\n')
+
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash may leave the last line truncated.
+                    logger.warning(f'Ignoring corrupted line in {self.__path}')
+                    continue
+
+                self.__status[entry['ticket']] = entry['status']
+                self.__last_line[entry['ticket']] = line_number
+
+        if truncated:
+            # Terminate the truncated line so the next entry starts on its own line.
+            with open(self.__path, 'a', encoding='utf-8') as file:
+                file.write('\n')
+
+        logger.info(f'Resuming from {self.__path}: {len(self.completed)} tickets already processed')
+
+    def __append(self, entry: dict) -> None:
+        """Append an entry to the journal file."""
+
+        line = json.dumps(entry, default=_encode_value, ensure_ascii=False)
+
+        with self.__lock:
+            self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(self.__path, 'a', encoding='utf-8') as file:
+                file.write(line + '\n')
+                file.flush()
+
+            self.__status[entry['ticket']] = entry['status']
+            self.__last_line[entry['ticket']] = self.__lines
+            self.__lines += 1
+
+    def record_success(self, ticket: str, data: dict) -> None:
+        """Record a processed ticket."""
+
+        self.__append({'ticket': ticket, 'status': self.DONE, 'data': data})
+
+    def record_failure(self, ticket: str, failure: dict) -> None:
+        """Record a ticket that could not be processed."""
+
+        self.__append({'ticket': ticket, 'status': self.FAILED, 'failure': failure})
+
+    def pending(self, portfolio: list) -> list:
+        """Filter the tickets of the portfolio not processed yet."""
+
+        completed = self.completed
+
+        return [ticket for ticket in portfolio if ticket not in completed]
+
+    def rows(self, tickets: list = None) -> Iterator[dict]:
+        """Stream the processed rows recorded in the journal, optionally only for tickets."""
+
+        tickets = set(tickets) if tickets else None
+
+        if not self.__path.exists():
+            return
+
+        with open(self.__path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if (entry['status'] == self.DONE and
+                        self.__last_line.get(entry['ticket']) == line_number and
+                        (tickets is None or entry['ticket'] in tickets)):
+                    yield entry['data']
+
+    def reset(self) -> None:
+        """Discard the journal and start from scratch."""
+
+        with self.__lock:
+            self.__status.clear()
+            self.__last_line.clear()
+            self.__lines = 0
+            self.__path.unlink(missing_ok=True)
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the last entry of each ticket."""
+
+        with self.__lock:
+            if not self.__path.exists():
+                return
+
+            temporary_path = self.__path.with_suffix('.tmp')
+            last_lines = set(self.__last_line.values())
+            lines = 0
+
+            with open(self.__path, 'r', encoding='utf-8') as source, \
+                    open(temporary_path, 'w', encoding='utf-8') as target:
+                for line_number, line in enumerate(source):
+                    if line_number in last_lines:
+                        target.write(line)
+                        lines += 1
+
+            os.replace(temporary_path, self.__path)
+
+            # Line numbers keep their order, so the last entries are renumbered in sequence.
+            order = {line_number: position
+                     for position, line_number in enumerate(sorted(last_lines))}
+            self.__last_line = {ticket: order[line_number]
+                                for ticket, line_number in self.__last_line.items()}
+            self.__lines = lines
+
+    def remove_stale(self) -> None:
+        """Remove the journals of the previous days, they are never resumed."""
+
+        for path in self.__path.parent.glob(f'{self.__file_name}_*.journal'):
+            if path != self.__path:
+                path.unlink(missing_ok=True)
@@ -17,9 +17,13 @@
 # ------------------------------------------------------------------------------
 """HTTP Requester - This module is responsible for making HTTP requests."""
 
+import concurrent.futures
+import threading
 from typing import Dict
 
 import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
 
 from fundamentus_hub.downloader.interfaces.requester import RequesterInterface
 
@@ -28,6 +32,10 @@ from fundamentus_hub.downloader.interfaces.requester import RequesterInterface
 class SGSRequester(RequesterInterface):
     """Represents a complete HTTP request."""
 
+    # Shared by every requester so the connections are kept alive between calls.
+    __session = None
+    __session_lock = threading.Lock()
+
     def __init__(self) -> None:
         """Initialize the class."""
 
@@ -36,12 +44,34 @@ class SGSRequester(RequesterInterface):
             '(KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
         }
 
-    @staticmethod
-    def __send_http_request(prepared_request: requests.PreparedRequest) -> requests.Response:
+    @classmethod
+    def __get_session(cls) -> requests.Session:
+        """Get the pooled session shared by every requester.
+
+        Returns:
+            requests.Session -- Pooled session.
+        """
+
+        with cls.__session_lock:
+            if cls.__session is None:
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+
+                cls.__session = session
+
+            return cls.__session
+
+    def __send_http_request(self,
+                            prepared_request: requests.PreparedRequest,
+                            timeout: float = None) -> requests.Response:
         """Send the HTTP request.
 
         Arguments:
             prepared_request {requests.PreparedRequest} -- Prepared request.
+            timeout {float} -- Seconds to wait for the server.
 
         Returns:
             requests.Response -- Response of the request.
@@ -50,14 +80,13 @@ class SGSRequester(RequesterInterface):
             HTTPError: If the request fails.
         """
 
-        with requests.Session() as session:
-            response = session.send(prepared_request)
+        response = self.__get_session().send(prepared_request, timeout=timeout)
 
-            response.raise_for_status()
+        response.raise_for_status()
 
-            return response
+        return response
 
-    def make_request(self, url: str) -> Dict:
+    def make_request(self, url: str, timeout: float = None) -> Dict:
         """Make request to the url and return the response.
 
         Returns:
@@ -73,9 +102,40 @@ class SGSRequester(RequesterInterface):
                                        headers=self.__headers)
 
             prepared_request = request.prepare()
-            response = self.__send_http_request(prepared_request)
+            response = self.__send_http_request(prepared_request, timeout)
 
             return response.json()
 
         except requests.exceptions.RequestException as error:
             raise error
+
+    def make_requests(self, urls: Dict[str, str], deadline: float) -> Dict:
+        """Make the requests concurrently, keeping the responses that arrive before the deadline.
+
+        Arguments:
+            urls {Dict[str, str]} -- URLs keyed by name.
+            deadline {float} -- Seconds to wait for the whole batch.
+
+        Returns:
+            Dict -- Responses keyed by name, failed or late requests are left out.
+        """
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(len(urls), 1))
+        futures = {executor.submit(self.make_request, url, deadline): name
+                   for name, url in urls.items()}
+
+        done, not_done = concurrent.futures.wait(futures, timeout=deadline)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        responses = {}
+        for future in done:
+            if future.exception() is not None:
+                logger.warning(f'Error requesting {futures[future]}: {future.exception()}')
+                continue
+
+            responses[futures[future]] = future.result()
+
+        for future in not_done:
+            logger.warning(f'{futures[future]} missed the {deadline}s deadline')
+
+        return responses
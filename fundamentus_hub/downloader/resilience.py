@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: resilience.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Retries, error classification and circuit breaker for the fetch path."""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import requests
+from fundamentus.exceptions.http_request_error import HttpRequestError
+from loguru import logger
+
+from fundamentus_hub.downloader.interfaces.handler import StockFetcherInterface
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+
+# The source is failing, trying again later may succeed.
+TRANSIENT = 'transient'
+# The ticket itself can not be fetched (e.g. the page has no data).
+PERMANENT = 'permanent'
+
+
+def _is_transient_status(status_code: int) -> bool:
+    """Rate limiting and server errors are worth a retry."""
+
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+def classify_error(error: Exception) -> str:
+    """Classify an error as transient or permanent.
+
+    pyfundamentus wraps network errors in ExtractException, so the whole
+    chain of causes is inspected.
+    """
+
+    cause = error
+    while cause is not None:
+        if isinstance(cause, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return TRANSIENT
+
+        if isinstance(cause, requests.exceptions.HTTPError):
+            response = cause.response
+            return TRANSIENT if _is_transient_status(
+                response.status_code if response is not None else None) else PERMANENT
+
+        if isinstance(cause, HttpRequestError):
+            return TRANSIENT if _is_transient_status(cause.status_code) else PERMANENT
+
+        cause = cause.__cause__
+
+    return PERMANENT
+
+
+class FailureRecord(NamedTuple):
+    """Structured record of a ticket that could not be fetched."""
+
+    ticket: str
+    error_class: str
+    attempts: int
+    kind: str
+    message: str
+
+    @classmethod
+    def from_error(cls, ticket: str, error: Exception, attempts: int = 1) -> 'FailureRecord':
+        """Build the record of an error."""
+
+        if isinstance(error, FetchFailure):
+            return error.record
+
+        if error is None:
+            return cls(ticket, 'NoData', attempts, PERMANENT, 'No data returned')
+
+        return cls(ticket, type(error).__name__, attempts, classify_error(error), str(error))
+
+
+class FetchFailure(Exception):
+    """Raised when a ticket could not be fetched after every attempt."""
+
+    def __init__(self, record: FailureRecord) -> None:
+        super().__init__(f'{record.ticket}: {record.error_class} after {record.attempts} attempts')
+        self.record = record
+
+
+# pylint: disable=too-few-public-methods
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self,
+                 max_attempts: int = DownloadCfg.RETRY_ATTEMPTS.value,
+                 base_delay: float = DownloadCfg.RETRY_BASE_DELAY.value,
+                 max_delay: float = DownloadCfg.RETRY_MAX_DELAY.value) -> None:
+        self.max_attempts = max(max_attempts, 1)
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before the next attempt."""
+
+        return random.uniform(0, min(self.__max_delay, self.__base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Pauses every request when the source starts failing broadly.
+
+    When at least `failure_ratio` of the last `window` requests failed
+    with a transient error, the circuit opens and callers block for
+    `cooldown` seconds before trying again.
+    """
+
+    def __init__(self,
+                 window: int = DownloadCfg.BREAKER_WINDOW.value,
+                 failure_ratio: float = DownloadCfg.BREAKER_FAILURE_RATIO.value,
+                 cooldown: float = DownloadCfg.BREAKER_COOLDOWN.value) -> None:
+        self.__outcomes = deque(maxlen=window)
+        self.__failure_ratio = failure_ratio
+        self.__cooldown = cooldown
+        self.__open_until = 0.0
+        self.__lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block while the circuit is open."""
+
+        while True:
+            with self.__lock:
+                remaining = self.__open_until - time.monotonic()
+
+            if remaining <= 0:
+                return
+
+            time.sleep(remaining)
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a request."""
+
+        with self.__lock:
+            self.__outcomes.append(success)
+
+            if len(self.__outcomes) < self.__outcomes.maxlen:
+                return
+
+            failures = self.__outcomes.count(False)
+            if failures / len(self.__outcomes) >= self.__failure_ratio:
+                self.__open_until = time.monotonic() + self.__cooldown
+                self.__outcomes.clear()
+
+                logger.warning(f'{failures} of the last {self.__outcomes.maxlen} requests failed, '
+                               f'pausing requests for {self.__cooldown:g}s')
+
+
+class ResilientStockFetcher(StockFetcherInterface):
+    """Stock Fetcher decorator that retries transient errors behind a circuit breaker."""
+
+    def __init__(self,
+                 fetcher: StockFetcherInterface,
+                 policy: RetryPolicy = None,
+                 breaker: CircuitBreaker = None) -> None:
+        self.__fetcher = fetcher
+        self.__policy = policy if policy is not None else RetryPolicy()
+        self.__breaker = breaker if breaker is not None else CircuitBreaker()
+
+    def get_all_tickets(self) -> list:
+        """Get all tickets from the wrapped fetcher"""
+
+        return self.__fetcher.get_all_tickets()
+
+    def get_data(self, ticket: str) -> list:
+        """Get data from the wrapped fetcher, retrying transient errors
+
+        Raises:
+            FetchFailure: If the ticket could not be fetched.
+        """
+
+        attempt = 0
+
+        while True:
+            attempt += 1
+            self.__breaker.wait()
+
+            try:
+                response = self.__fetcher.get_data(ticket)
+            except Exception as error:  # pylint: disable=broad-except
+                kind = classify_error(error)
+
+                if kind == TRANSIENT:
+                    self.__breaker.record(False)
+
+                if kind == PERMANENT or attempt >= self.__policy.max_attempts:
+                    raise FetchFailure(FailureRecord(ticket,
+                                                     type(error).__name__,
+                                                     attempt,
+                                                     kind,
+                                                     str(error))) from error
+
+                delay = self.__policy.delay(attempt)
+                logger.warning(f'Attempt {attempt} for {ticket} failed ({type(error).__name__}), '
+                               f'retrying in {delay:.1f}s')
+                time.sleep(delay)
+                continue
+
+            self.__breaker.record(True)
+
+            return response
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: series.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Local store of the SGS time series, refreshed incrementally."""
+
+import datetime
+import threading
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+from fundamentus_hub.downloader.interfaces.requester import RequesterInterface
+from fundamentus_hub.downloader.requester import SGSRequester
+from fundamentus_hub.utilities.configuration import SGSAPIConfiguration as SGSCfg
+
+# Date format of the SGS API.
+_SGS_DATE_FORMAT = '%d/%m/%Y'
+
+
+class SGSSeriesStore:
+    """Keeps every SGS series on disk, one CSV file per series.
+
+    The first refresh of a series downloads its whole history in the
+    background, without the deadline of the render; the next ones only ask
+    the API for the observations after the last stored date and append them
+    to the file. Reads are served from the local files.
+    """
+
+    HEADER = 'data;valor\n'
+
+    # Shared by every store, so concurrent dashboard sessions never append twice.
+    __lock = threading.Lock()
+    # Series whose history is being downloaded, shared so it is only requested once.
+    __backfilling = set()
+
+    def __init__(self,
+                 requester: RequesterInterface = None,
+                 store_path: str = SGSCfg.STORE_PATH.value) -> None:
+        self.__requester = requester if requester is not None else SGSRequester()
+        self.__path = Path(store_path)
+
+        self.__path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def indicators() -> list:
+        """Names of the configured series."""
+
+        return [indicator.name for indicator in SGSCfg if isinstance(indicator.value, dict)]
+
+    def __series_path(self, name: str) -> Path:
+        """Path of the file of a series."""
+
+        return self.__path / f'{name}.csv'
+
+    def __last_line(self, name: str) -> str:
+        """Read the last line of a series file without reading the whole file."""
+
+        try:
+            with open(self.__series_path(name), 'rb') as file:
+                file.seek(0, 2)
+                position = file.tell()
+                block = b''
+
+                while position > 0 and block.count(b'\n') < 2:
+                    step = min(512, position)
+                    position -= step
+                    file.seek(position)
+                    block = file.read(step) + block
+        except FileNotFoundError:
+            return None
+
+        lines = block.decode('utf-8').strip().splitlines()
+
+        return lines[-1] if lines and lines[-1] != self.HEADER.strip() else None
+
+    def last_observation(self, name: str) -> tuple:
+        """Date and value of the last stored observation of a series, if any."""
+
+        line = self.__last_line(name)
+        if line is None:
+            return None
+
+        date, value = line.split(';')
+
+        return datetime.date.fromisoformat(date), float(value)
+
+    def latest(self, name: str) -> float:
+        """Last stored value of a series, if any."""
+
+        observation = self.last_observation(name)
+
+        return observation[1] if observation is not None else None
+
+    def read(self, name: str, start: datetime.date = None, end: datetime.date = None) -> pd.Series:
+        """Read the stored observations of a series, optionally within a date range."""
+
+        try:
+            data = pd.read_csv(self.__series_path(name), sep=';', parse_dates=['data'])
+        except FileNotFoundError:
+            return pd.Series(dtype='float64', name=name)
+
+        series = data.set_index('data')['valor'].rename(name)
+
+        return series.loc[pd.Timestamp(start) if start else None:
+                          pd.Timestamp(end) if end else None]
+
+    def __request_url(self, name: str, today: datetime.date) -> str:
+        """URL of the observations missing from the store, None when it is up to date."""
+
+        url = SGSCfg[name].value['url']
+
+        observation = self.last_observation(name)
+        if observation is None:
+            return url
+
+        first_missing = observation[0] + datetime.timedelta(days=1)
+        if first_missing > today:
+            return None
+
+        return (f'{url}&dataInicial={first_missing.strftime(_SGS_DATE_FORMAT)}'
+                f'&dataFinal={today.strftime(_SGS_DATE_FORMAT)}')
+
+    def __append(self, name: str, response: list) -> int:
+        """Append the observations newer than the last stored one, returning how many."""
+
+        observation = self.last_observation(name)
+        last_date = observation[0] if observation is not None else None
+
+        lines = []
+        for item in response:
+            date = datetime.datetime.strptime(item['data'], _SGS_DATE_FORMAT).date()
+
+            if last_date is not None and date <= last_date:
+                continue
+
+            lines.append(f'{date.isoformat()};{float(item["valor"])}\n')
+            last_date = date
+
+        if not lines:
+            return 0
+
+        series_path = self.__series_path(name)
+        new_file = not series_path.exists()
+
+        with open(series_path, 'a', encoding='utf-8') as file:
+            if new_file:
+                file.write(self.HEADER)
+            file.writelines(lines)
+
+        return len(lines)
+
+    def __store_responses(self, responses: dict) -> dict:
+        """Append the responses to their series, returning how many observations each got."""
+
+        appended = {}
+        with self.__lock:
+            for name, response in responses.items():
+                try:
+                    appended[name] = self.__append(name, response or [])
+                except (KeyError, TypeError, ValueError) as error:
+                    logger.warning(f'Discarding malformed response of {name}: {error}')
+
+        return appended
+
+    def __backfill(self, urls: dict) -> None:
+        """Download the whole history of the new series and store it."""
+
+        try:
+            appended = self.__store_responses(
+                self.__requester.make_requests(urls, SGSCfg.BACKFILL_TIMEOUT.value))
+
+            logger.debug(f'SGS backfill: {sum(appended.values())} observations '
+                         f'in {len(urls)} requests')
+        finally:
+            with self.__lock:
+                self.__backfilling.difference_update(urls)
+
+    def __start_backfill(self, urls: dict) -> None:
+        """Start the backfill of the series not already being downloaded."""
+
+        with self.__lock:
+            urls = {name: url for name, url in urls.items() if name not in self.__backfilling}
+            self.__backfilling.update(urls)
+
+        if urls:
+            threading.Thread(target=self.__backfill, args=(urls,),
+                             name='sgs-backfill', daemon=True).start()
+
+    def refresh(self, names: list = None, deadline: float = SGSCfg.REQUEST_DEADLINE.value) -> dict:
+        """Fetch the new observations of the series concurrently.
+
+        Only the incremental requests are bound by the deadline; the series
+        without any stored observation are backfilled in the background and
+        show up in a later refresh.
+
+        Returns:
+            dict -- Number of observations appended, keyed by series name.
+        """
+
+        names = names if names is not None else self.indicators()
+        today = datetime.date.today()
+
+        urls, backfill_urls = {}, {}
+        for name in names:
+            url = self.__request_url(name, today)
+            if url is None:
+                continue
+
+            if self.last_observation(name) is None:
+                backfill_urls[name] = url
+            else:
+                urls[name] = url
+
+        if backfill_urls:
+            self.__start_backfill(backfill_urls)
+
+        responses = self.__requester.make_requests(urls, deadline) if urls else {}
+        appended = self.__store_responses(responses)
+
+        logger.debug(f'SGS refresh: {sum(appended.values())} new observations '
+                     f'in {len(urls)} requests, {len(backfill_urls)} series backfilling')
+
+        return appended
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: throttle.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Requests-per-second budget of the calls to the Fundamentus host."""
+
+import threading
+import time
+
+from fundamentus_hub.downloader.interfaces.handler import StockFetcherInterface
+
+
+# pylint: disable=too-few-public-methods
+class RateLimiter:
+    """Spaces request starts so a single host sees at most `rate` requests per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.__interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self.__next_slot = 0.0
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait until the next request slot is available, from any thread."""
+
+        if not self.__interval:
+            return
+
+        with self.__lock:
+            now = time.monotonic()
+            wait = self.__next_slot - now
+            self.__next_slot = max(now, self.__next_slot) + self.__interval
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+class RateLimitedStockFetcher(StockFetcherInterface):
+    """Stock Fetcher decorator that takes a rate limiter slot before every request.
+
+    It wraps the fetcher that talks to the host, so each attempt of a retried
+    ticket takes a slot and responses served by a cache take none.
+    """
+
+    def __init__(self, fetcher: StockFetcherInterface, rate: float) -> None:
+        self.__fetcher = fetcher
+        self.__limiter = RateLimiter(rate)
+
+    def get_all_tickets(self) -> list:
+        """Get all tickets from the wrapped fetcher"""
+
+        self.__limiter.acquire()
+
+        return self.__fetcher.get_all_tickets()
+
+    def get_data(self, ticket: str) -> list:
+        """Get data from the wrapped fetcher"""
+
+        self.__limiter.acquire()
+
+        return self.__fetcher.get_data(ticket)
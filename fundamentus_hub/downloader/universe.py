@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: universe.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Persisted universe of listed tickers."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from loguru import logger
+
+from fundamentus_hub.downloader.interfaces.handler import StockFetcherInterface
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+
+
+class UniverseDiff(NamedTuple):
+    """Tickers added and delisted between two versions of the universe."""
+
+    added: list
+    delisted: list
+
+    @classmethod
+    def between(cls, previous: list, current: list) -> 'UniverseDiff':
+        """Compare two versions of the universe."""
+
+        previous, current = set(previous), set(current)
+
+        return cls(sorted(current - previous), sorted(previous - current))
+
+
+class UniverseCachedStockFetcher(StockFetcherInterface):
+    """Stock Fetcher decorator that persists the list of all tickets.
+
+    While the persisted list is younger than `ttl` seconds it is used as
+    is. Once it expires, it is still returned right away and the list is
+    refreshed in a background thread, logging the tickers added and
+    delisted since the previous version.
+    """
+
+    def __init__(self,
+                 fetcher: StockFetcherInterface,
+                 universe_file: str = DownloadCfg.UNIVERSE_FILE.value,
+                 ttl: int = DownloadCfg.UNIVERSE_TTL.value) -> None:
+        self.__fetcher = fetcher
+        self.__path = Path(universe_file)
+        self.__ttl = ttl
+        self.__refresh_thread = None
+
+        self.last_diff = None
+
+    def __read(self) -> tuple:
+        """Read the persisted universe, if any."""
+
+        try:
+            with open(self.__path, encoding='utf-8') as file:
+                universe = json.load(file)
+
+            return universe['fetched_at'], universe['tickets']
+        except FileNotFoundError:
+            return None, None
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.warning(f'Ignoring corrupted universe file {self.__path}')
+            return None, None
+
+    def __write(self, tickets: list) -> None:
+        """Persist the universe atomically."""
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.__path.with_suffix('.tmp')
+
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'fetched_at': time.time(), 'tickets': tickets}, file)
+
+        os.replace(temporary_path, self.__path)
+
+    def refresh(self, previous: list = None) -> list:
+        """Fetch the universe from the wrapped fetcher and persist it."""
+
+        tickets = self.__fetcher.get_all_tickets()
+        self.__write(tickets)
+
+        if previous is not None:
+            self.last_diff = UniverseDiff.between(previous, tickets)
+            logger.info(f'Ticker universe refreshed: {len(tickets)} tickers, '
+                        f'{len(self.last_diff.added)} added {self.last_diff.added}, '
+                        f'{len(self.last_diff.delisted)} delisted {self.last_diff.delisted}')
+
+        return tickets
+
+    def __refresh_in_background(self, previous: list) -> None:
+        """Refresh the universe without blocking the caller."""
+
+        def refresh() -> None:
+            try:
+                self.refresh(previous)
+            except Exception as error:  # pylint: disable=broad-except
+                logger.warning(f'Could not refresh the ticker universe: {error}')
+
+        self.__refresh_thread = threading.Thread(target=refresh, name='universe-refresh')
+        self.__refresh_thread.start()
+
+    def wait(self) -> None:
+        """Wait for a background refresh to finish."""
+
+        if self.__refresh_thread is not None:
+            self.__refresh_thread.join()
+
+    def get_all_tickets(self) -> list:
+        """Get all tickets from the persisted universe, refreshing it when expired"""
+
+        fetched_at, tickets = self.__read()
+
+        if tickets is None:
+            return self.refresh()
+
+        if time.time() - fetched_at > self.__ttl:
+            logger.info('Ticker universe expired, refreshing it in the background')
+            self.__refresh_in_background(tickets)
+
+        return list(tickets)
+
+    def get_data(self, ticket: str) -> list:
+        """Get data from the wrapped fetcher"""
+
+        return self.__fetcher.get_data(ticket)
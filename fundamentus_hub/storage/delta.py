@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: delta.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Snapshot history stored as periodic keyframes plus daily deltas."""
+
+import datetime
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from loguru import logger
+
+from fundamentus_hub.storage.manifest import SnapshotManifest
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import (CATEGORICAL_COLUMNS, CODE_COLUMN, DATE_COLUMNS,
+                                              TEXT_COLUMNS, enforce_schema, to_arrow_table)
+
+# Column of a delta cell that marks a ticker removed from the snapshot.
+REMOVED = '*'
+
+# Long layout of a delta: one row per changed cell.
+DELTA_SCHEMA = pa.schema([
+    pa.field('code', pa.string()),
+    pa.field('column', pa.dictionary(pa.int16(), pa.string())),
+    pa.field('number', pa.float64()),
+    pa.field('text', pa.string()),
+])
+
+
+def _normalize(table: pa.Table) -> pd.DataFrame:
+    """Snapshot indexed by ticker code, with plain object text and ISO date columns."""
+
+    data_frame = table.to_pandas()
+
+    for column in data_frame.columns:
+        if isinstance(data_frame[column].dtype, pd.CategoricalDtype):
+            data_frame[column] = data_frame[column].astype(object)
+        elif column in DATE_COLUMNS:
+            dates = pd.to_datetime(data_frame[column]).dt.strftime('%Y-%m-%d')
+            data_frame[column] = dates.astype(object).where(dates.notna(), None)
+
+    return data_frame.set_index(CODE_COLUMN)
+
+
+def _is_text(column: str) -> bool:
+    """Whether a column holds text instead of numbers, dates are kept as ISO text."""
+
+    return column in TEXT_COLUMNS or column in CATEGORICAL_COLUMNS or column in DATE_COLUMNS
+
+
+def diff_snapshots(previous: pd.DataFrame, current: pd.DataFrame) -> pa.Table:
+    """Cells of `current` that differ from `previous`, both indexed by ticker code."""
+
+    codes, columns, numbers, texts = [], [], [], []
+
+    def add(cell_codes, column, values, text: bool) -> None:
+        codes.append(np.asarray(cell_codes, dtype=object))
+        columns.append(np.full(len(cell_codes), column, dtype=object))
+        numbers.append(np.full(len(cell_codes), np.nan) if text else
+                       np.asarray(values, dtype='float64'))
+        texts.append(np.asarray(values, dtype=object) if text else
+                     np.full(len(cell_codes), None, dtype=object))
+
+    removed = previous.index.difference(current.index)
+    add(removed, REMOVED, [None] * len(removed), True)
+
+    added = ~current.index.isin(previous.index)
+    # Columns dropped from the layout are cleared.
+    all_columns = list(current.columns) + [column for column in previous.columns
+                                           if column not in current.columns]
+    aligned = previous.reindex(index=current.index, columns=all_columns)
+    current = current.reindex(columns=all_columns)
+
+    for column in all_columns:
+        new_values, old_values = current[column], aligned[column]
+        new_null, old_null = new_values.isna().to_numpy(), old_values.isna().to_numpy()
+
+        equal = (new_values.to_numpy() == old_values.to_numpy()) | (new_null & old_null)
+        # Every cell of an added ticker is kept, so the row exists even if empty.
+        changed = ~equal | added
+
+        if changed.any():
+            values = new_values[changed]
+            add(values.index, column, values.where(values.notna(), None), _is_text(column))
+
+    return pa.Table.from_arrays([pa.array(np.concatenate(codes), pa.string()),
+                                 pa.array(np.concatenate(columns), pa.string()).dictionary_encode(),
+                                 pa.array(np.concatenate(numbers), pa.float64(), from_pandas=True),
+                                 pa.array(np.concatenate(texts), pa.string())],
+                                schema=DELTA_SCHEMA)
+
+
+def apply_delta(snapshot: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    """Apply the cells of a delta to a snapshot indexed by ticker code."""
+
+    snapshot = snapshot.drop(index=delta.loc[delta['column'] == REMOVED, 'code'], errors='ignore')
+    cells = delta[delta['column'] != REMOVED]
+
+    new_codes = pd.Index(cells['code'].unique()).difference(snapshot.index)
+    new_columns = [column for column in cells['column'].unique() if column not in snapshot.columns]
+    if len(new_codes) or new_columns:
+        snapshot = snapshot.reindex(index=snapshot.index.append(new_codes),
+                                    columns=[*snapshot.columns, *new_columns])
+
+    for column, column_cells in cells.groupby('column', observed=True, sort=False):
+        rows = snapshot.index.get_indexer(column_cells['code'])
+        values = column_cells['text' if _is_text(column) else 'number'].to_numpy()
+
+        if _is_text(column) and snapshot[column].dtype != object:
+            snapshot[column] = snapshot[column].astype(object)
+
+        snapshot.iloc[rows, snapshot.columns.get_loc(column)] = values
+
+    return snapshot
+
+
+def merge_deltas(deltas: list) -> pd.DataFrame:
+    """Merge consecutive deltas into one, so a snapshot is rebuilt in a single pass.
+
+    The last cell of each (ticker, column) wins. Cells written before the last
+    removal of a ticker are dropped, as a ticker that comes back is stored
+    again in full.
+    """
+
+    # Empty deltas are left out, pandas no longer wants them in a concat.
+    cells = pd.concat([delta.assign(order=order) for order, delta in enumerate(deltas)
+                       if len(delta)] or [deltas[0].assign(order=0)],
+                      ignore_index=True)
+    cells['column'] = cells['column'].astype(object)
+
+    removals = cells[cells['column'] == REMOVED]
+    last_removal = removals.groupby('code')['order'].max()
+
+    cells = cells[cells['column'] != REMOVED]
+    cells = cells[cells['order'] > cells['code'].map(last_removal).fillna(-1).to_numpy()]
+    cells = cells.drop_duplicates(['code', 'column'], keep='last')
+
+    parts = [part for part in (removals.drop_duplicates('code'), cells) if len(part)]
+
+    return pd.concat(parts or [cells], ignore_index=True).drop(columns='order')
+
+
+class DeltaSnapshotStore:
+    """Daily snapshots stored as full keyframes and deltas of changed cells.
+
+    A keyframe holds a whole snapshot; each delta holds, in long format, only
+    the cells that changed since the previous snapshot. A keyframe is written
+    every `keyframe_interval` stored snapshots or when a delta would change more than
+    `keyframe_ratio` of the cells, so rebuilding a date costs one keyframe
+    plus a bounded number of small deltas.
+    """
+
+    KEYFRAME = 'keyframe'
+    DELTA = 'delta'
+
+    def __init__(self,
+                 store_path: str = DownloadCfg.DELTA_PATH.value,
+                 keyframe_interval: int = DownloadCfg.DELTA_KEYFRAME_INTERVAL.value,
+                 keyframe_ratio: float = DownloadCfg.DELTA_KEYFRAME_RATIO.value,
+                 manifest: SnapshotManifest = None,
+                 compression: str = DownloadCfg.DATA_COMPRESSION.value['delta']) -> None:
+        self.__path = Path(store_path)
+        self.__keyframe_interval = keyframe_interval
+        self.__keyframe_ratio = keyframe_ratio
+        self.__manifest = manifest if manifest is not None else SnapshotManifest()
+        self.__compression = compression
+
+    def __files(self) -> list:
+        """(date, kind, path) of the stored files, in ascending date order."""
+
+        if not self.__path.exists():
+            return []
+
+        files = []
+        for path in self.__path.glob('*.parquet'):
+            kind, date = path.stem.split('-', 1)
+            files.append((datetime.date.fromisoformat(date), kind, path))
+
+        return sorted(files)
+
+    def dates(self) -> list:
+        """Dates of the stored snapshots, in ascending order."""
+
+        return [snapshot_date for snapshot_date, _, _ in self.__files()]
+
+    def __chain(self, snapshot_date: datetime.date) -> list:
+        """Files to read to rebuild a date: its keyframe and the following deltas."""
+
+        chain = []
+        for file_date, kind, path in self.__files():
+            if file_date > snapshot_date:
+                break
+
+            if kind == self.KEYFRAME:
+                chain = []
+            chain.append((file_date, kind, path))
+
+        if not chain or chain[-1][0] != snapshot_date:
+            raise KeyError(f'No snapshot of {snapshot_date} in {self.__path}')
+
+        return chain
+
+    def read(self,
+             snapshot_date: datetime.date,
+             tickers: list = None,
+             columns: list = None) -> pd.DataFrame:
+        """Rebuild the snapshot of a date, optionally only some tickers and columns."""
+
+        chain = self.__chain(snapshot_date)
+        # Typed, so an empty list of tickers selects nothing instead of failing.
+        codes = pa.array(list(tickers), pa.string()) if tickers is not None else None
+        ticker_filter = pc.field(CODE_COLUMN).isin(codes) if codes is not None else None
+
+        keyframe_path = chain[0][2]
+        keyframe_columns = None
+        if columns is not None:
+            wanted = {CODE_COLUMN, *columns}
+            keyframe_columns = [name for name in pq.ParquetFile(keyframe_path).schema_arrow.names
+                                if name in wanted]
+
+        snapshot = _normalize(pq.read_table(keyframe_path,
+                                            columns=keyframe_columns,
+                                            filters=ticker_filter))
+
+        cell_filter = pc.field('code').isin(codes) if codes is not None else None
+        deltas = [pq.read_table(path, filters=cell_filter).to_pandas() for _, _, path in chain[1:]]
+        if deltas:
+            delta = merge_deltas(deltas)
+            if columns is not None:
+                delta = delta[delta['column'].isin([REMOVED, *columns])]
+            snapshot = apply_delta(snapshot, delta)
+
+        return enforce_schema(snapshot.sort_index().reset_index(names=CODE_COLUMN))
+
+    def __write_file(self, kind: str, snapshot_date: datetime.date, table: pa.Table) -> Path:
+        """Write a keyframe or delta file atomically."""
+
+        path = self.__path / f'{kind}-{snapshot_date.isoformat()}.parquet'
+        temporary_path = path.with_suffix('.tmp')
+
+        pq.write_table(table, temporary_path, compression=self.__compression or 'none')
+        os.replace(temporary_path, path)
+
+        return path
+
+    def write(self, data_frame: pd.DataFrame, snapshot_date: datetime.date = None) -> Path:
+        """Write the snapshot of a date as a delta of the previous snapshot or as a keyframe.
+
+        Only the last date can be replaced; older dates are immutable.
+        """
+
+        snapshot_date = snapshot_date or datetime.date.today()
+        self.__path.mkdir(parents=True, exist_ok=True)
+
+        files = self.__files()
+        if files and files[-1][0] > snapshot_date:
+            raise ValueError(f'Can not write {snapshot_date}, {files[-1][0]} is already stored')
+        # The file of the same date is only removed once its replacement is in place.
+        replaced = files.pop()[2] if files and files[-1][0] == snapshot_date else None
+
+        table = to_arrow_table(data_frame)
+
+        deltas = 0
+        for _, kind, _ in reversed(files):
+            if kind == self.KEYFRAME:
+                break
+            deltas += 1
+
+        kind = self.KEYFRAME
+        if files and deltas + 1 < self.__keyframe_interval:
+            # Both sides go through the arrow schema, so their cells compare alike.
+            previous = _normalize(to_arrow_table(self.read(files[-1][0])))
+            delta = diff_snapshots(previous, _normalize(table))
+            if delta.num_rows <= self.__keyframe_ratio * data_frame.size:
+                kind, table = self.DELTA, delta
+
+        path = self.__write_file(kind, snapshot_date, table)
+        if replaced is not None and replaced != path:
+            replaced.unlink()
+        self.__manifest.record(snapshot_date, path, 'delta', len(data_frame))
+
+        logger.info(f'Stored the snapshot of {snapshot_date} as a {kind} '
+                    f'({table.num_rows} rows) in {path}')
+
+        return path
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: history.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Time series of some metrics of some tickers over the snapshot history."""
+
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+
+from fundamentus_hub.storage.manifest import ManifestEntry, SnapshotManifest
+from fundamentus_hub.storage.snapshots import SnapshotStore, read_entry
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import CODE_COLUMN, enforce_schema, to_arrow_table
+
+# Column holding the snapshot date in the history.
+DATE_COLUMN = 'Data'
+LAYOUTS = ('tidy', 'wide')
+
+
+@lru_cache(maxsize=DownloadCfg.HISTORY_CACHE_SIZE.value)
+def _read_cached(data_path: str, entry: ManifestEntry, tickers: tuple, columns: tuple) -> pa.Table:
+    """Read some tickers and columns of a snapshot once, with its date.
+
+    Store partitions are decoded by arrow alone, which releases the GIL, so
+    they are read in parallel by the threads. The entry carries the checksum
+    of the file, so a rewritten snapshot is a new key and is never served
+    from a stale read.
+    """
+
+    manifest = SnapshotManifest(data_path)
+
+    if entry.file_format == 'store':
+        table = SnapshotStore.read_partition_table(manifest.resolve(entry).parent,
+                                                   list(tickers),
+                                                   list(columns))
+    else:
+        table = to_arrow_table(read_entry(manifest, entry, list(tickers), list(columns)))
+
+    return table.append_column(DATE_COLUMN,
+                               pa.array([entry.snapshot_date] * table.num_rows, pa.date32()))
+
+
+def query_history(tickers: list,
+                  metrics: list,
+                  start: datetime.date = None,
+                  end: datetime.date = None,
+                  layout: str = 'tidy',
+                  manifest: SnapshotManifest = None,
+                  max_workers: int = DownloadCfg.HISTORY_MAX_WORKERS.value) -> pd.DataFrame:
+    """Values of some metrics of some tickers on the snapshots between two dates, both included.
+
+    The snapshots are read in parallel, each one only for the requested
+    tickers and metrics, and converted to pandas once. The 'tidy' layout has
+    one row per date and ticker, with the ticker code and one column per
+    metric; the 'wide' layout has one row per date and (metric, ticker)
+    columns. Both are indexed by date.
+    """
+
+    if layout not in LAYOUTS:
+        raise ValueError(f'Unknown layout: {layout}')
+
+    manifest = manifest if manifest is not None else SnapshotManifest()
+    entries = [entry for entry in manifest.entries()
+               if (start is None or entry.snapshot_date >= start)
+               and (end is None or entry.snapshot_date <= end)]
+
+    tickers, metrics = tuple(tickers), tuple(metrics)
+    data_path = str(manifest.path.parent)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tables = list(executor.map(lambda entry: _read_cached(data_path, entry, tickers, metrics),
+                                   entries))
+
+    columns = [DATE_COLUMN, CODE_COLUMN, *metrics]
+    # Snapshots written before a metric existed lack its column.
+    history = (pa.concat_tables(tables, promote_options='permissive').to_pandas() if tables
+               else pd.DataFrame())
+    history = history.reindex(columns=columns)
+
+    dates = pd.DatetimeIndex(pd.to_datetime(history.pop(DATE_COLUMN)), name=DATE_COLUMN)
+    history = enforce_schema(history).set_axis(dates)
+
+    if layout == 'wide':
+        return history.pivot(columns=CODE_COLUMN, values=list(metrics))
+
+    return history
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: manifest.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Manifest of the persisted snapshots."""
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from loguru import logger
+
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import SCHEMA_VERSION
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 of a file, read in chunks."""
+
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1_048_576), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class ManifestEntry(NamedTuple):
+    """A persisted snapshot."""
+
+    date: str
+    path: str
+    file_format: str
+    rows: int
+    schema_version: int
+    checksum: str
+
+    @property
+    def snapshot_date(self) -> datetime.date:
+        """Date of the snapshot."""
+
+        return datetime.date.fromisoformat(self.date)
+
+
+class SnapshotManifest:
+    """JSON manifest of the snapshots, one entry per date.
+
+    Paths are stored relative to the manifest, so the data directory can be
+    copied or restored without breaking it and without relying on mtimes.
+    """
+
+    FILE_NAME = 'manifest.json'
+
+    # Shared by every manifest, entries are recorded from the fetch threads.
+    __lock = threading.Lock()
+
+    def __init__(self, data_path: str = DownloadCfg.DATA_PATH.value) -> None:
+        self.__directory = Path(data_path)
+        self.__path = self.__directory / self.FILE_NAME
+
+    @property
+    def path(self) -> Path:
+        """Path of the manifest file."""
+
+        return self.__path
+
+    def exists(self) -> bool:
+        """Whether the manifest file exists."""
+
+        return self.__path.exists()
+
+    def __load(self) -> dict:
+        """Load the entries keyed by date."""
+
+        try:
+            with open(self.__path, encoding='utf-8') as file:
+                snapshots = json.load(file)['snapshots']
+        except FileNotFoundError:
+            return {}
+
+        return {snapshot_date: ManifestEntry(**entry) for snapshot_date, entry in snapshots.items()}
+
+    def __save(self, entries: dict) -> None:
+        """Write the manifest atomically."""
+
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.__path.with_suffix('.tmp')
+
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'snapshots': {snapshot_date: entries[snapshot_date]._asdict()
+                                     for snapshot_date in sorted(entries)}},
+                      file,
+                      ensure_ascii=False,
+                      indent=1)
+
+        os.replace(temporary_path, self.__path)
+
+    def record(self,
+               snapshot_date: datetime.date,
+               path: Path,
+               file_format: str,
+               rows: int) -> ManifestEntry:
+        """Record the snapshot of a date, replacing the previous one of the same date."""
+
+        path = Path(path)
+        entry = ManifestEntry(date=snapshot_date.isoformat(),
+                              path=Path(os.path.relpath(path, self.__directory)).as_posix(),
+                              file_format=file_format,
+                              rows=rows,
+                              schema_version=SCHEMA_VERSION,
+                              checksum=file_checksum(path))
+
+        with self.__lock:
+            entries = self.__load()
+            entries[entry.date] = entry
+            self.__save(entries)
+
+        return entry
+
+    def entries(self) -> list:
+        """Entries in ascending date order."""
+
+        entries = self.__load()
+
+        return [entries[snapshot_date] for snapshot_date in sorted(entries)]
+
+    def latest(self) -> ManifestEntry:
+        """Entry of the most recent snapshot, if any."""
+
+        entries = self.entries()
+
+        return entries[-1] if entries else None
+
+    def baseline(self) -> ManifestEntry:
+        """Entry of the first snapshot, the baseline of the comparisons, if any."""
+
+        entries = self.entries()
+
+        return entries[0] if entries else None
+
+    def resolve(self, entry: ManifestEntry) -> Path:
+        """Path of the file of an entry."""
+
+        return self.__directory / entry.path
+
+    def verify(self, entry: ManifestEntry) -> bool:
+        """Check that the file of an entry is still the one that was recorded."""
+
+        path = self.resolve(entry)
+        if not path.exists() or file_checksum(path) != entry.checksum:
+            logger.warning(f'Snapshot of {entry.date} does not match the manifest: {path}')
+            return False
+
+        return True
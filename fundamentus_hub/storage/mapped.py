@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: mapped.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Memory-mapped Arrow IPC copies of the snapshots, shared by every session."""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from loguru import logger
+
+from fundamentus_hub.storage.manifest import ManifestEntry, SnapshotManifest
+from fundamentus_hub.storage.snapshots import read_entry
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import CODE_COLUMN, enforce_schema, to_arrow_table
+
+
+def mapped_snapshot_path(entry: ManifestEntry,
+                         mapped_path: str = DownloadCfg.MAPPED_SNAPSHOT_PATH.value) -> Path:
+    """Path of the Arrow IPC copy of a snapshot, tied to its checksum."""
+
+    return Path(mapped_path) / f'{entry.date}-{entry.checksum[:16]}.arrow'
+
+
+def write_mapped_snapshot(manifest: SnapshotManifest,
+                          entry: ManifestEntry,
+                          mapped_path: str = DownloadCfg.MAPPED_SNAPSHOT_PATH.value) -> Path:
+    """Write the uncompressed Arrow IPC copy of a snapshot, removing the older copies."""
+
+    path = mapped_snapshot_path(entry, mapped_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = to_arrow_table(read_entry(manifest, entry))
+    temporary_path = path.with_suffix(f'.{os.getpid()}.tmp')
+
+    # Uncompressed buffers can be mapped as they are, with no decoding.
+    with pa.OSFile(str(temporary_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    os.replace(temporary_path, path)
+
+    for stale_path in path.parent.glob('*.arrow'):
+        if stale_path != path:
+            stale_path.unlink(missing_ok=True)
+
+    logger.info(f'Mapped snapshot of {entry.date} written to {path}')
+
+    return path
+
+
+def open_mapped_snapshot(manifest: SnapshotManifest,
+                         entry: ManifestEntry,
+                         mapped_path: str = DownloadCfg.MAPPED_SNAPSHOT_PATH.value) -> pa.Table:
+    """Open the memory-mapped Arrow IPC copy of a snapshot, writing it first if needed.
+
+    The table is backed by the page cache, so every process that maps the
+    file shares the same physical memory.
+    """
+
+    path = mapped_snapshot_path(entry, mapped_path)
+    if not path.exists():
+        path = write_mapped_snapshot(manifest, entry, mapped_path)
+
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+
+def select_rows(table: pa.Table, tickers: list = None, columns: list = None) -> pd.DataFrame:
+    """Materialize only some tickers and columns of a mapped snapshot."""
+
+    if columns is not None:
+        wanted = {CODE_COLUMN, *columns}
+        table = table.select([name for name in table.column_names if name in wanted])
+
+    if tickers is not None:
+        table = table.filter(pc.is_in(table[CODE_COLUMN], value_set=pa.array(tickers, pa.string())))
+
+    return enforce_schema(table.to_pandas())
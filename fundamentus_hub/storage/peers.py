@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: peers.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Peer statistics of the snapshots, stored next to them and tied to their checksum."""
+
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from fundamentus_hub.storage.manifest import ManifestEntry, SnapshotManifest
+from fundamentus_hub.storage.snapshots import read_entry
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.peers import PeerStatistics, compute_peer_statistics
+
+
+def peer_statistics_paths(entry: ManifestEntry,
+                          peers_path: str = DownloadCfg.PEERS_PATH.value) -> PeerStatistics:
+    """Paths of the group statistics and ranks of a snapshot."""
+
+    stem = f'{entry.date}-{entry.checksum[:16]}'
+
+    return PeerStatistics(*(Path(peers_path) / f'{stem}-{part}.parquet'
+                            for part in PeerStatistics._fields))
+
+
+def write_peer_statistics(manifest: SnapshotManifest,
+                          entry: ManifestEntry,
+                          peers_path: str = DownloadCfg.PEERS_PATH.value) -> PeerStatistics:
+    """Compute and store the peer statistics of a snapshot, removing the older ones."""
+
+    paths = peer_statistics_paths(entry, peers_path)
+    Path(peers_path).mkdir(parents=True, exist_ok=True)
+
+    statistics = compute_peer_statistics(read_entry(manifest, entry))
+
+    for frame, path in zip(statistics, paths):
+        temporary_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        pq.write_table(pa.Table.from_pandas(frame), temporary_path, compression='zstd')
+        os.replace(temporary_path, path)
+
+    for stale_path in Path(peers_path).glob('*.parquet'):
+        if stale_path not in paths:
+            stale_path.unlink(missing_ok=True)
+
+    logger.info(f'Peer statistics of {entry.date} written to {peers_path}')
+
+    return statistics
+
+
+def open_peer_statistics(manifest: SnapshotManifest,
+                         entry: ManifestEntry,
+                         peers_path: str = DownloadCfg.PEERS_PATH.value) -> PeerStatistics:
+    """Read the peer statistics of a snapshot, computing them first if needed."""
+
+    paths = peer_statistics_paths(entry, peers_path)
+    if not all(path.exists() for path in paths):
+        return write_peer_statistics(manifest, entry, peers_path)
+
+    return PeerStatistics(*(pq.read_table(path).to_pandas() for path in paths))
@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: snapshots.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Dated snapshot files and the historical snapshot store partitioned by date."""
+
+import bz2
+import datetime
+import gzip
+import lzma
+import os
+from pathlib import Path
+from typing import Iterable, TextIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from loguru import logger
+
+from fundamentus_hub.storage.delta import DeltaSnapshotStore
+from fundamentus_hub.storage.manifest import ManifestEntry, SnapshotManifest
+from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
+from fundamentus_hub.utilities.schema import CODE_COLUMN, enforce_schema, to_arrow_table
+
+# Rows parsed at a time when filtering the tickers of a CSV snapshot.
+CSV_CHUNK_ROWS = 4096
+# Suffix added to the name of a compressed CSV or pickle snapshot by each codec.
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz', 'zstd': '.zst'}
+
+
+def _projection(available: list, columns: list) -> list:
+    """Requested columns that exist in a snapshot, always with the ticker code."""
+
+    if columns is None:
+        return None
+
+    wanted = {CODE_COLUMN, *columns}
+
+    return [column for column in available if column in wanted]
+
+
+def compression_suffix(file_format: str, compression: str = None) -> str:
+    """Suffix of a compressed snapshot file, parquet files are compressed inside."""
+
+    if file_format not in ('csv', 'pkl') or compression is None:
+        return ''
+
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f'Unknown {file_format} compression {compression}')
+
+    return COMPRESSION_SUFFIXES[compression]
+
+
+def snapshot_format(file: Path) -> str:
+    """Format of a snapshot file (e.g. csv for .csv and .csv.gz files), None for other files."""
+
+    suffixes = file.suffixes
+    if len(suffixes) == 1 or (len(suffixes) == 2 and
+                              suffixes[1] in COMPRESSION_SUFFIXES.values()):
+        return suffixes[0][1:]
+
+    return None
+
+
+def write_snapshot(data_frame: pd.DataFrame, file: Path, compression: str = None) -> None:
+    """Write a snapshot file according to its format, replacing the file at once.
+
+    CSV and pickle files are compressed as a whole, parquet files by column
+    chunk; the codec of a CSV or pickle file is read back from its suffix.
+    """
+
+    file_format = snapshot_format(file)
+    # The codec is passed explicitly, the temporary name hides the file suffix.
+    temporary_path = file.with_name(f'{file.name}.tmp')
+
+    if file_format == 'pkl':
+        data_frame.to_pickle(temporary_path, compression=compression)
+    elif file_format == 'csv':
+        data_frame.to_csv(temporary_path,
+                          index=False,
+                          sep=';',
+                          encoding='utf-8',
+                          compression=compression)
+    elif file_format == 'parquet':
+        pq.write_table(to_arrow_table(data_frame),
+                       temporary_path,
+                       compression=compression or 'none')
+    else:
+        raise ValueError(f'Unknown snapshot format {file_format}')
+
+    # Readers only ever see complete files.
+    os.replace(temporary_path, file)
+
+
+def open_text(file: Path, mode: str = 'r', compression: str = None) -> TextIO:
+    """Open a text file, through the codec of a compressed CSV snapshot if any."""
+
+    if compression is None:
+        return open(file, mode, newline='', encoding='utf-8')
+
+    if compression == 'zstd':
+        import zstandard  # pylint: disable=import-outside-toplevel
+
+        return zstandard.open(file, f'{mode}t', newline='', encoding='utf-8')
+
+    openers = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+    if compression not in openers:
+        raise ValueError(f'Unknown csv compression {compression}')
+
+    return openers[compression](file, f'{mode}t', newline='', encoding='utf-8')
+
+
+def write_csv_batches(batches: Iterable[pd.DataFrame], file: Path, compression: str = None) -> int:
+    """Write batches of rows to a CSV snapshot, one batch in memory at a time.
+
+    The rows go through a compressed file handle and the file is replaced
+    at once, as with write_snapshot. Returns the number of rows written.
+    """
+
+    temporary_path = file.with_name(f'{file.name}.tmp')
+    rows = 0
+
+    with open_text(temporary_path, 'w', compression) as handle:
+        for batch in batches:
+            batch.to_csv(handle, index=False, sep=';', header=rows == 0)
+            rows += len(batch)
+
+    os.replace(temporary_path, file)
+
+    return rows
+
+
+def read_snapshot(file: Path, tickers: list = None, columns: list = None) -> pd.DataFrame:
+    """Read a snapshot file according to its format, optionally only some tickers and columns.
+
+    Parquet files read only the projected columns and skip the row groups
+    without the tickers; CSV files are parsed in chunks, keeping only the
+    projected columns and the rows of the tickers.
+    """
+
+    file_format = snapshot_format(file)
+
+    if file_format == 'parquet':
+        names = pq.ParquetFile(file).schema_arrow.names
+        # Typed, so an empty list of tickers selects nothing instead of failing.
+        filters = (pc.field(CODE_COLUMN).isin(pa.array(list(tickers), pa.string()))
+                   if tickers is not None else None)
+
+        return pq.read_table(file,
+                             columns=_projection(names, columns),
+                             filters=filters).to_pandas()
+
+    if file_format == 'pkl':
+        data_frame = pd.read_pickle(file)
+        if tickers is not None:
+            data_frame = data_frame[data_frame[CODE_COLUMN].isin(tickers)].reset_index(drop=True)
+
+        return data_frame if columns is None else data_frame[_projection(data_frame.columns,
+                                                                         columns)]
+
+    # Columns missing from the file are ignored, as with the other formats.
+    usecols = {CODE_COLUMN, *columns}.__contains__ if columns is not None else None
+
+    if tickers is None:
+        return pd.read_csv(file, delimiter=';', usecols=usecols)
+
+    with pd.read_csv(file, delimiter=';', usecols=usecols, chunksize=CSV_CHUNK_ROWS) as reader:
+        frames = [chunk[chunk[CODE_COLUMN].isin(tickers)] for chunk in reader]
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def snapshot_file_date(file: Path) -> datetime.date:
+    """Date of a dated snapshot file (e.g. fundamentus_data_31-12-2024.csv)."""
+
+    return datetime.datetime.strptime(file.name.split('.', 1)[0].rsplit('_', 1)[-1],
+                                      '%d-%m-%Y').date()
+
+
+class SnapshotStore:
+    """Daily snapshots stored as one parquet partition per date.
+
+    Each partition holds a single file whose rows are sorted by ticker code
+    within each written batch. Reading some tickers of some dates only opens
+    those partitions and skips the row groups whose code statistics can not
+    hold the tickers.
+    """
+
+    DATA_FILE = 'snapshot.parquet'
+
+    def __init__(self,
+                 store_path: str = DownloadCfg.SNAPSHOT_PATH.value,
+                 row_group_size: int = DownloadCfg.SNAPSHOT_ROW_GROUP_SIZE.value,
+                 manifest: SnapshotManifest = None,
+                 compression: str = DownloadCfg.DATA_COMPRESSION.value['store']) -> None:
+        self.__path = Path(store_path)
+        self.__row_group_size = row_group_size
+        self.__compression = compression
+        self.__manifest = manifest if manifest is not None else SnapshotManifest()
+
+    @property
+    def path(self) -> Path:
+        """Root directory of the store."""
+
+        return self.__path
+
+    def partition_path(self, snapshot_date: datetime.date) -> Path:
+        """Directory of the partition of a date."""
+
+        return self.__path / f'date={snapshot_date.isoformat()}'
+
+    def dates(self) -> list:
+        """Dates of the stored snapshots, in ascending order."""
+
+        if not self.__path.exists():
+            return []
+
+        return sorted(datetime.date.fromisoformat(partition.name.split('=', 1)[1])
+                      for partition in self.__path.glob('date=*')
+                      if (partition / self.DATA_FILE).exists())
+
+    def write(self, data_frame: pd.DataFrame, snapshot_date: datetime.date = None) -> Path:
+        """Write the snapshot of a date, replacing the previous one of the same date."""
+
+        return self.write_batches([data_frame], snapshot_date)
+
+    def write_batches(self,
+                      batches: Iterable[pd.DataFrame],
+                      snapshot_date: datetime.date = None) -> Path:
+        """Write the snapshot of a date from batches of rows with the same columns.
+
+        Each batch is sorted by ticker code and appended as row groups, so only
+        one batch is in memory at a time. The previous snapshot of the same
+        date is replaced.
+        """
+
+        snapshot_date = snapshot_date or datetime.date.today()
+        partition_path = self.partition_path(snapshot_date)
+        data_path = partition_path / self.DATA_FILE
+        temporary_path = data_path.with_name(f'{self.DATA_FILE}.{os.getpid()}.tmp')
+
+        partition_path.mkdir(parents=True, exist_ok=True)
+
+        writer = None
+        rows = 0
+        try:
+            for batch in batches:
+                table = to_arrow_table(batch.sort_values(CODE_COLUMN,
+                                                         kind='stable',
+                                                         ignore_index=True))
+
+                if writer is None:
+                    writer = pq.ParquetWriter(temporary_path,
+                                              table.schema,
+                                              compression=self.__compression or 'none')
+                if table.num_rows:
+                    writer.write_table(table, row_group_size=self.__row_group_size)
+                    rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            raise ValueError(f'No rows to store for {snapshot_date}')
+
+        # Readers see either the previous file or the new one, never no partition.
+        os.replace(temporary_path, data_path)
+
+        self.__manifest.record(snapshot_date, data_path, 'store', rows)
+
+        logger.info(f'Stored {rows} rows in {partition_path}')
+
+        return partition_path
+
+    def read(self,
+             snapshot_date: datetime.date,
+             tickers: list = None,
+             columns: list = None) -> pd.DataFrame:
+        """Read the snapshot of a date, optionally only some tickers and columns."""
+
+        return self.read_partition(self.partition_path(snapshot_date), tickers, columns)
+
+    @classmethod
+    def read_partition(cls,
+                       partition_path: Path,
+                       tickers: list = None,
+                       columns: list = None) -> pd.DataFrame:
+        """Read a partition, optionally only some tickers and columns."""
+
+        return cls.read_partition_table(partition_path, tickers, columns).to_pandas()
+
+    @classmethod
+    def read_partition_table(cls,
+                             partition_path: Path,
+                             tickers: list = None,
+                             columns: list = None) -> pa.Table:
+        """Read a partition as an arrow table, optionally only some tickers and columns."""
+
+        data_path = partition_path / cls.DATA_FILE
+        parquet_file = pq.ParquetFile(data_path)
+        columns = _projection(parquet_file.schema_arrow.names, columns)
+
+        if tickers is None:
+            return parquet_file.read(columns=columns)
+
+        # Row groups whose code statistics can not hold the tickers are not decoded.
+        return pq.read_table(data_path,
+                             columns=columns,
+                             filters=pc.field(CODE_COLUMN).isin(pa.array(list(tickers),
+                                                                         pa.string())))
+
+    def import_snapshots(self, directory: str = DownloadCfg.DATA_PATH.value) -> list:
+        """Import the dated snapshot files of a directory that are not in the store yet.
+
+        Partitions missing from the manifest are recorded as well.
+        """
+
+        self.record_partitions()
+
+        stored = set(self.dates())
+        imported = []
+
+        for snapshot_date, file in dated_snapshot_files(directory):
+            if snapshot_date in stored:
+                continue
+
+            self.write(read_snapshot(file), snapshot_date)
+            stored.add(snapshot_date)
+            imported.append(snapshot_date)
+
+        return imported
+
+    def record_partitions(self) -> list:
+        """Record the partitions missing from the manifest, returning their dates."""
+
+        recorded = {entry.snapshot_date for entry in self.__manifest.entries()}
+        missing = sorted(set(self.dates()) - recorded)
+
+        for snapshot_date in missing:
+            data_path = self.partition_path(snapshot_date) / self.DATA_FILE
+            self.__manifest.record(snapshot_date,
+                                   data_path,
+                                   'store',
+                                   pq.ParquetFile(data_path).metadata.num_rows)
+
+        return missing
+
+
+def dated_snapshot_files(directory: str = DownloadCfg.DATA_PATH.value) -> list:
+    """(date, path) of the dated snapshot files of a directory, in ascending date order."""
+
+    files = []
+    for file in Path(directory).glob(f'{DownloadCfg.DATA_FILE.value}_*.*'):
+        if snapshot_format(file) not in ('csv', 'parquet', 'pkl'):
+            continue
+
+        try:
+            files.append((snapshot_file_date(file), file))
+        except ValueError:
+            continue
+
+    return sorted(files)
+
+
+def record_snapshot_files(manifest: SnapshotManifest,
+                          directory: str = DownloadCfg.DATA_PATH.value) -> list:
+    """Record the dated snapshot files of a directory missing from the manifest, where they are.
+
+    The files are not converted, see SnapshotStore.import_snapshots for that.
+    """
+
+    recorded = {entry.snapshot_date for entry in manifest.entries()}
+    missing = []
+
+    for snapshot_date, file in dated_snapshot_files(directory):
+        if snapshot_date in recorded:
+            continue
+
+        if snapshot_format(file) == 'parquet':
+            rows = pq.ParquetFile(file).metadata.num_rows
+        else:
+            rows = len(read_snapshot(file, columns=[CODE_COLUMN]))
+
+        manifest.record(snapshot_date, file, snapshot_format(file), rows)
+        recorded.add(snapshot_date)
+        missing.append(snapshot_date)
+
+    return missing
+
+
+def read_entry(manifest: SnapshotManifest,
+               entry: ManifestEntry,
+               tickers: list = None,
+               columns: list = None) -> pd.DataFrame:
+    """Read the snapshot of a manifest entry, whatever its format, typed by the schema registry."""
+
+    path = manifest.resolve(entry)
+
+    if entry.file_format == 'store':
+        data_frame = SnapshotStore.read_partition(path.parent, tickers, columns)
+    elif entry.file_format == 'delta':
+        data_frame = DeltaSnapshotStore(path.parent, manifest=manifest).read(entry.snapshot_date,
+                                                                            tickers,
+                                                                            columns)
+    else:
+        data_frame = read_snapshot(path, tickers, columns)
+
+    return enforce_schema(data_frame)
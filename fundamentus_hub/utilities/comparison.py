@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: comparison.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Vectorized comparison of two snapshots."""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from fundamentus_hub.utilities.schema import CODE_COLUMN
+
+
+class SnapshotChanges(NamedTuple):
+    """Changes of every numeric metric of every ticker, indexed by ticker code."""
+
+    absolute: pd.DataFrame
+    percentage: pd.DataFrame
+
+
+def compare_snapshots(baseline: pd.DataFrame, latest: pd.DataFrame) -> SnapshotChanges:
+    """Compare the numeric metrics of two snapshots, aligned on the ticker code.
+
+    Tickers and metrics missing from either snapshot get NaN changes; the
+    percentage change is relative to the absolute baseline value and NaN
+    when the baseline is zero.
+    """
+
+    latest = latest.set_index(CODE_COLUMN)
+    baseline = baseline.set_index(CODE_COLUMN)
+
+    metrics = latest.select_dtypes('number').columns
+
+    new_values = latest[metrics].to_numpy(dtype='float64', na_value=np.nan)
+    old_values = baseline.reindex(index=latest.index, columns=metrics).apply(
+        pd.to_numeric, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+    absolute = new_values - old_values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage = np.where(old_values != 0, absolute / np.abs(old_values), np.nan)
+
+    return SnapshotChanges(pd.DataFrame(absolute, index=latest.index, columns=metrics),
+                           pd.DataFrame(percentage, index=latest.index, columns=metrics))
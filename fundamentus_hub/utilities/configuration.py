@@ -30,6 +30,10 @@ class StreamlitConfiguration(Enum):
     }
 
     TITLE = 'Fundamentus Hub'
+    # Portfolio rendering: 'selector' builds only the selected ticker, 'tabs' builds
+    # every ticker in its own tab on each rerun.
+    RENDER_MODE = 'selector'
+
     DESCRIPTION = 'Este projeto cria um dashboard utilizando a API pyfundamentus para exibir os principais indicadores financeiros das empresas listadas na B3, facilitando a análise fundamentalista através de visualizações claras e acessíveis para investidores e analistas.'
 
 
@@ -40,6 +44,12 @@ class SGSAPIConfiguration(Enum):
     __API = 'http://api.bcb.gov.br/dados/serie/bcdata.sgs.{}/dados?formato={}'
     # API response format.
     __RESPONSE_FORMAT = 'json'
+    # Seconds to wait for the whole batch of incremental refreshes.
+    REQUEST_DEADLINE = 5.0
+    # Seconds to wait for the full history of a new series, downloaded in the background.
+    BACKFILL_TIMEOUT = 120.0
+    # Local store of the series, refreshed incrementally.
+    STORE_PATH = 'data//sgs//'
 
     # 432 - Taxa de juros - Meta Selic definida pelo Copom.
     TAXA_SELIC = {'url': __API.format(432, __RESPONSE_FORMAT),
@@ -106,4 +116,58 @@ class SGSAPIConfiguration(Enum):
 class DownloadHandler(Enum):
     DATA_PATH = 'data//'
     DATA_FILE = 'fundamentus_data'
-    DATA_FORMAT = 'csv'
+    # Snapshot format: 'store', 'delta', 'csv', 'pkl' or 'parquet'.
+    DATA_FORMAT = 'store'
+    # Codec of each snapshot format, None to write uncompressed files. CSV and pickle
+    # files take 'gzip', 'bz2', 'xz' or 'zstd' (needs the zstandard package) and get
+    # the codec suffix; the parquet based formats take 'snappy', 'gzip', 'brotli',
+    # 'lz4' or 'zstd'. Compare them with benchmarks/storage_benchmark.py.
+    DATA_COMPRESSION = {'csv': None,
+                        'pkl': None,
+                        'parquet': 'zstd',
+                        'store': 'zstd',
+                        'delta': 'zstd'}
+    # Snapshot store, one partition per date.
+    SNAPSHOT_PATH = 'data//snapshots//'
+    # Rows per row group of a partition; large enough for the columns to compress well,
+    # a whole universe of tickers fits in one.
+    SNAPSHOT_ROW_GROUP_SIZE = 8192
+    # Delta history: a full keyframe every DELTA_KEYFRAME_INTERVAL stored snapshots
+    # (days with a download, not calendar days), or when more than
+    # DELTA_KEYFRAME_RATIO of the cells changed, and deltas in between.
+    DELTA_PATH = 'data//deltas//'
+    DELTA_KEYFRAME_INTERVAL = 30
+    DELTA_KEYFRAME_RATIO = 0.5
+    # Memory-mapped Arrow IPC copy of the latest snapshot, shared by the dashboard sessions.
+    MAPPED_SNAPSHOT_PATH = 'data//mapped//'
+    # Sector and subsector statistics of the latest snapshot, computed once per snapshot.
+    PEERS_PATH = 'data//peers//'
+    # Snapshots read in parallel by a history query, and snapshot reads kept in memory.
+    HISTORY_MAX_WORKERS = 8
+    HISTORY_CACHE_SIZE = 512
+    # Fetch engine: 'thread' or 'async'.
+    FETCH_ENGINE = 'thread'
+    # Ceiling of in-flight requests for the async engine.
+    MAX_CONCURRENCY = 8
+    # Requests per second sent to the Fundamentus host (0 disables the limit).
+    REQUESTS_PER_SECOND = 5.0
+    # On-disk response cache.
+    CACHE_PATH = 'data//cache//'
+    # Time to live of a cached response, in seconds; the same 12 hours as the HTTP
+    # cache of pyfundamentus (requests_cache, expire_after=43200), so a response is
+    # never kept here after the page it came from would have been fetched again.
+    CACHE_TTL = 12 * 60 * 60
+    # Maximum size of the cache on disk, in bytes.
+    CACHE_MAX_SIZE = 256 * 1024 * 1024
+    # List of all listed tickers, refreshed in the background once expired.
+    UNIVERSE_FILE = 'data//universe.json'
+    UNIVERSE_TTL = 24 * 60 * 60
+    # Attempts per ticket, transient errors are retried with jittered exponential backoff.
+    RETRY_ATTEMPTS = 4
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+    # The circuit breaker pauses the requests for BREAKER_COOLDOWN seconds when
+    # BREAKER_FAILURE_RATIO of the last BREAKER_WINDOW requests failed.
+    BREAKER_WINDOW = 20
+    BREAKER_FAILURE_RATIO = 0.5
+    BREAKER_COOLDOWN = 60.0
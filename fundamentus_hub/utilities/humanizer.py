@@ -16,6 +16,16 @@
 #  License: MIT
 #  ------------------------------------------------------------------------------
 
+import numpy as np
+import pandas as pd
+
+# Shown in place of a missing value.
+MISSING_VALUE = '-'
+
+# Thresholds, divisors and suffixes of the humanized monetary values.
+MAGNITUDES = [(1_000_000_000, ' B'), (1_000_000, ' M'), (1_000, ' mil')]
+
+
 def format_metrics_value(raw_value: float, output_format: str) -> str:
     """Format the value according to the output format.
 
@@ -27,6 +37,9 @@ def format_metrics_value(raw_value: float, output_format: str) -> str:
         The formatted value.
     """
 
+    if pd.isna(raw_value):
+        return MISSING_VALUE
+
     if output_format == 'percent_aa':
         return f'{raw_value:.2f}% a.a.'
 
@@ -51,8 +64,11 @@ def format_value(value: float,
         is_percentage (bool): Whether the value is a percentage value.
 
     Returns:
-        str: The formatted value.
+        str: The formatted value, '-' for a missing value.
     """
+    if pd.isna(value):
+        return MISSING_VALUE
+
     if is_monetary:
         return humanize_number(value)
 
@@ -70,8 +86,11 @@ def to_percentage(value: float) -> str:
         value (float): The value to be converted into a percentage.
 
     Returns:
-        str: The percentage representation of the value.
+        str: The percentage representation of the value, '-' if it is missing.
     """
+    if pd.isna(value):
+        return MISSING_VALUE
+
     return f'{value * 100:.2f}%'
 
 
@@ -87,9 +106,12 @@ def humanize_number(value) -> str:
 
     Returns:
         str: A human-readable version of the number with
-             appropriate suffix or an error message.
+             appropriate suffix, '-' if it is missing.
     """
 
+    if pd.isna(value):
+        return MISSING_VALUE
+
     if value == 0:
         return f'R$ {value:.0f}'
 
@@ -103,3 +125,176 @@ def humanize_number(value) -> str:
         humanized_value = f'R$ {value:.3f}'
 
     return humanized_value
+
+
+def _to_numbers(values) -> np.ndarray:
+    """Float array of a Series or array, missing values as NaN."""
+
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype='float64', na_value=np.nan)
+
+    return np.asarray(values, dtype='float64')
+
+
+def _like(values, strings, missing: np.ndarray, missing_value=MISSING_VALUE):
+    """Strings shaped as the input: a Series keeps its index, anything else is an array."""
+
+    strings = np.array(strings, dtype=object)
+    strings[missing] = missing_value
+
+    if isinstance(values, pd.Series):
+        return pd.Series(strings, index=values.index, name=values.name)
+
+    return strings
+
+
+def _fixed(numbers: np.ndarray,
+           decimals: int,
+           prefix: str = '',
+           suffix: str = '',
+           sign: str = '') -> list:
+    """
+    Formats numbers as f'{prefix}{number:{sign}.{decimals}f}{suffix}'.
+
+    A single %-template is mapped over the numbers, which skips the call,
+    the branches and the missing value check of the scalar path per number.
+
+    Parameters:
+        numbers (np.ndarray): The numbers to be formatted.
+        decimals (int): The number of decimal places.
+        prefix (str): Text before the number.
+        suffix (str): Text after the number.
+        sign (str): '+' to show the sign of the positive numbers.
+
+    Returns:
+        list: The formatted numbers, the missing ones are undefined.
+    """
+    template = f'{prefix.replace("%", "%%")}%{sign}.{decimals}f{suffix.replace("%", "%%")}'
+
+    return list(map(template.__mod__, numbers.tolist()))
+
+
+def humanize_numbers(values):
+    """
+    Vectorized humanize_number over a Series or array.
+
+    Parameters:
+        values: The numbers to be humanized.
+
+    Returns:
+        The humanized numbers, '-' for the missing ones.
+    """
+    numbers = _to_numbers(values)
+    magnitude = np.abs(numbers)
+
+    # Numbers of each magnitude share a divisor and a suffix, the last ones have neither.
+    magnitudes = [*MAGNITUDES, (1, '')]
+    groups = np.select([magnitude >= threshold for threshold, _ in MAGNITUDES],
+                       range(len(MAGNITUDES)),
+                       len(MAGNITUDES))
+
+    strings = np.empty(numbers.shape, dtype=object)
+    for group, (divisor, suffix) in enumerate(magnitudes):
+        positions = np.flatnonzero(groups == group)
+        strings[positions] = _fixed(numbers[positions] / divisor, 3, 'R$ ', suffix)
+
+    zeros = np.flatnonzero(numbers == 0)
+    strings[zeros] = _fixed(numbers[zeros], 0, 'R$ ')
+
+    return _like(values, strings, np.isnan(numbers))
+
+
+def to_percentages(values):
+    """
+    Vectorized to_percentage over a Series or array.
+
+    Parameters:
+        values: The values to be converted into percentages.
+
+    Returns:
+        The percentages, '-' for the missing values.
+    """
+    numbers = _to_numbers(values)
+
+    return _like(values, _fixed(numbers * 100, 2, suffix='%'), np.isnan(numbers))
+
+
+def format_numbers(values):
+    """
+    Formats numbers with two decimal places, over a Series or array.
+
+    Parameters:
+        values: The numbers to be formatted.
+
+    Returns:
+        The formatted numbers, '-' for the missing ones.
+    """
+    numbers = _to_numbers(values)
+
+    return _like(values, _fixed(numbers, 2), np.isnan(numbers))
+
+
+def format_metrics_values(raw_values, output_format: str):
+    """
+    Vectorized format_metrics_value over a Series or array.
+
+    Parameters:
+        raw_values: The raw values to be formatted.
+        output_format (str): The output format.
+
+    Returns:
+        The formatted values, '-' for the missing ones.
+    """
+    numbers = _to_numbers(raw_values)
+
+    if output_format == 'percent_aa':
+        strings = _fixed(numbers, 2, suffix='% a.a.')
+    elif output_format == 'percent_am':
+        strings = _fixed(numbers, 2, suffix='% a.m.')
+    elif output_format == 'currency':
+        strings = [f'R${number:,.2f}' for number in numbers.tolist()]
+    else:
+        strings = _fixed(numbers, 2)
+
+    return _like(raw_values, strings, np.isnan(numbers))
+
+
+def format_changes(values):
+    """
+    Formats relative changes as signed percentages, over a Series or array.
+
+    Parameters:
+        values: The relative changes.
+
+    Returns:
+        The signed percentages, None for the missing changes.
+    """
+    numbers = _to_numbers(values)
+
+    return _like(values, _fixed(numbers * 100, 2, suffix='%', sign='+'), np.isnan(numbers), None)
+
+
+def format_dates(values) -> pd.Series:
+    """
+    Formats a Series of dates as dd/mm/yyyy.
+
+    Parameters:
+        values (pd.Series): The dates to be formatted.
+
+    Returns:
+        pd.Series: The formatted dates, '-' for the missing ones.
+    """
+    return pd.to_datetime(values).dt.strftime('%d/%m/%Y').astype(object).fillna(MISSING_VALUE)
+
+
+def format_texts(values) -> pd.Series:
+    """
+    Converts a Series to text.
+
+    Parameters:
+        values (pd.Series): The values to be converted.
+
+    Returns:
+        pd.Series: The values as text, '-' for the missing ones.
+    """
+    return values.astype(object).where(values.notna(), MISSING_VALUE).astype(str)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: peers.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Sector and subsector statistics of a snapshot, and the rank of each ticker among its peers."""
+
+from typing import NamedTuple
+
+import pandas as pd
+
+from fundamentus_hub.utilities.schema import CODE_COLUMN
+
+# Peer groups, from the widest.
+SECTOR_COLUMN = 'Setor'
+SUBSECTOR_COLUMN = 'Subsetor'
+PEER_LEVELS = [SECTOR_COLUMN, SUBSECTOR_COLUMN]
+
+# Index of the group statistics.
+LEVEL_COLUMN = 'Nível'
+GROUP_COLUMN = 'Grupo'
+METRIC_COLUMN = 'Indicador'
+
+# Statistics of each metric in each group.
+COUNT_COLUMN = 'Empresas'
+QUARTILES = {'1º quartil': 0.25, 'Mediana': 0.5, '3º quartil': 0.75}
+# Percentile rank of a ticker in its sector, from 0 to 1.
+RANK_COLUMN = 'Percentil no setor'
+
+
+class PeerStatistics(NamedTuple):
+    """Group statistics indexed by (level, group, metric) and sector ranks indexed by ticker."""
+
+    groups: pd.DataFrame
+    ranks: pd.DataFrame
+
+
+def compute_peer_statistics(snapshot: pd.DataFrame) -> PeerStatistics:
+    """Count, quartiles and median of every numeric metric per sector and subsector, and the
+    percentile rank of each ticker in its sector.
+
+    Missing values are left out of the statistics and get no rank.
+    """
+
+    snapshot = snapshot.set_index(CODE_COLUMN)
+    metrics = list(snapshot.select_dtypes('number').columns)
+
+    levels = []
+    for level in PEER_LEVELS:
+        grouped = snapshot.groupby(level, observed=True)[metrics]
+
+        quantiles = grouped.quantile(list(QUARTILES.values())).unstack()
+        quantiles = quantiles.stack(level=0, future_stack=True)
+        quantiles.columns = list(QUARTILES)
+
+        counts = grouped.count().stack(future_stack=True).rename(COUNT_COLUMN)
+
+        statistics = pd.concat([counts, quantiles], axis=1)
+        statistics.index = pd.MultiIndex.from_arrays(
+            [[level] * len(statistics),
+             statistics.index.get_level_values(0).astype(str),
+             statistics.index.get_level_values(1)],
+            names=[LEVEL_COLUMN, GROUP_COLUMN, METRIC_COLUMN])
+        levels.append(statistics)
+
+    ranks = snapshot.groupby(SECTOR_COLUMN, observed=True)[metrics].rank(pct=True)
+    ranks.insert(0, SECTOR_COLUMN, snapshot[SECTOR_COLUMN].astype(object))
+    ranks.insert(1, SUBSECTOR_COLUMN, snapshot[SUBSECTOR_COLUMN].astype(object))
+
+    return PeerStatistics(pd.concat(levels).sort_index(), ranks)
+
+
+def peer_context(statistics: PeerStatistics,
+                 code: str,
+                 metrics: list,
+                 level: str = SECTOR_COLUMN) -> pd.DataFrame:
+    """Sector rank and group statistics of some metrics of a ticker, indexed by metric.
+
+    Only lookups, the statistics are computed once per snapshot.
+    """
+
+    columns = [RANK_COLUMN, COUNT_COLUMN, *QUARTILES]
+
+    if code not in statistics.ranks.index or pd.isna(statistics.ranks.at[code, level]):
+        return pd.DataFrame(index=pd.Index(metrics, name=METRIC_COLUMN), columns=columns)
+
+    group = statistics.ranks.at[code, level]
+    context = statistics.groups.loc[(level, group)].reindex(metrics)
+    context.insert(0, RANK_COLUMN, statistics.ranks.loc[code].reindex(metrics))
+
+    return context[columns]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: schema.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Schema registry of the snapshot columns."""
+
+import re
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+# Version of the snapshot layout, recorded in the manifest.
+SCHEMA_VERSION = 2
+
+# Column of the ticker code, the key of the snapshots.
+CODE_COLUMN = 'Código'
+
+# Date format of the Fundamentus pages.
+DATE_FORMAT = '%d/%m/%Y'
+
+# Types of the columns of each FundamentusCategories section. The columns whose
+# names change over time (e.g. the oscillation of each year) are matched by
+# 'pattern' and get the 'default' type of the section.
+SCHEMA_REGISTRY = {
+    'stock_identification': {
+        'columns': {'Código': 'string', 'Empresa': 'string'},
+    },
+    'financial_summary': {
+        'columns': {'Valor de mercado': 'float64',
+                    'Valor da firma': 'float64',
+                    'Nº de ações': 'int64',
+                    'Último balanço': 'date',
+                    'Setor': 'category',
+                    'Subsetor': 'category'},
+    },
+    'price_information': {
+        'columns': {'Cotação': 'float32', 'Última cotação': 'date'},
+    },
+    'detailed_information': {
+        'columns': {'Tipo': 'category',
+                    'Volume negociado por dia': 'float64',
+                    'VPA': 'float32',
+                    'LPA': 'float32'},
+        'pattern': r'_variation_52_weeks$',
+        'default': 'float32',
+    },
+    'oscillations': {
+        'columns': dict.fromkeys(['dia', 'mês', '30 dias', '12 meses'], 'float32'),
+        'pattern': r'^\d{4}$',
+        'default': 'float32',
+    },
+    'valuation_indicators': {
+        'columns': dict.fromkeys(['P/L', 'P/VP', 'P/EBIT', 'PSR', 'Preço/Ativos',
+                                  'Preço/Ativ circ liq', 'Dividend Yield', 'EV/EBITDA',
+                                  'EV/EBIT', 'Preço/Capital de giro'], 'float32'),
+    },
+    'profitability_indicators': {
+        'columns': dict.fromkeys(['ROE', 'ROIC', 'EBIT/Ativo', 'Crescimento receita',
+                                  'Giro ativos', 'Margem bruta', 'Margem EBIT',
+                                  'Margem líquida'], 'float32'),
+    },
+    'indebtedness_indicators': {
+        'columns': dict.fromkeys(['Liquidez corrente', 'Dívida bruta/Patrim',
+                                  'Dívida líquida/Patrim', 'Dívida líquida/EBITDA',
+                                  'PL/Ativos'], 'float32'),
+    },
+    # Monetary values in R$ need the precision of float64, the layout of banks
+    # differs, so every column of these sections falls back to the default type.
+    'balance_sheet': {'columns': {}},
+    'income_statement': {'columns': {}},
+}
+
+# Type of the columns that are not in the registry (e.g. monetary values).
+DEFAULT_TYPE = 'float64'
+
+# Columns declared by the registry.
+COLUMN_TYPES = {column: declared_type
+                for section in SCHEMA_REGISTRY.values()
+                for column, declared_type in section['columns'].items()}
+
+# Dynamic columns, matched by name.
+PATTERN_TYPES = [(re.compile(section['pattern']), section['default'])
+                 for section in SCHEMA_REGISTRY.values() if 'pattern' in section]
+
+# Free text columns.
+TEXT_COLUMNS = [column for column, declared_type in COLUMN_TYPES.items()
+                if declared_type == 'string']
+
+# Low cardinality text columns, dictionary encoded.
+CATEGORICAL_COLUMNS = [column for column, declared_type in COLUMN_TYPES.items()
+                       if declared_type == 'category']
+
+# Date columns.
+DATE_COLUMNS = [column for column, declared_type in COLUMN_TYPES.items()
+                if declared_type == 'date']
+
+# Pandas and arrow types of each registry type.
+_PANDAS_TYPES = {'string': object, 'category': 'category', 'date': 'datetime64[ns]',
+                 'int64': 'Int64', 'float32': 'float32', 'float64': 'float64'}
+_ARROW_TYPES = {'string': pa.string(), 'category': pa.dictionary(pa.int32(), pa.string()),
+                'date': pa.date32(), 'int64': pa.int64(), 'float32': pa.float32(),
+                'float64': pa.float64()}
+
+
+def column_type(column: str) -> str:
+    """Registry type of a column."""
+
+    declared = COLUMN_TYPES.get(column)
+    if declared is not None:
+        return declared
+
+    for pattern, pattern_type in PATTERN_TYPES:
+        if pattern.search(column):
+            return pattern_type
+
+    return DEFAULT_TYPE
+
+
+def _parse_dates(column: pd.Series) -> pd.Series:
+    """Parse the dates of the Fundamentus pages, falling back to ISO dates."""
+
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.astype('datetime64[ns]')
+
+    text = column.astype('string')
+    dates = pd.to_datetime(text, format=DATE_FORMAT, errors='coerce')
+
+    missing = dates.isna() & text.notna()
+    if missing.any():
+        dates[missing] = pd.to_datetime(text[missing], format='ISO8601', errors='coerce')
+
+    return dates.astype('datetime64[ns]')
+
+
+def _enforce_column(column: pd.Series, registry_type: str) -> pd.Series:
+    """Convert a column to the pandas type of its registry type."""
+
+    if registry_type == 'date':
+        return _parse_dates(column)
+
+    if registry_type == 'string':
+        return column.astype(object).where(column.notna(), None)
+
+    if registry_type == 'category':
+        return column.astype(object).where(column.notna(), None).astype('category')
+
+    numbers = pd.to_numeric(column, errors='coerce')
+    if registry_type == 'int64':
+        return numbers.round().astype('Int64')
+
+    return numbers.astype(_PANDAS_TYPES[registry_type])
+
+
+def enforce_schema(data_frame: pd.DataFrame, report: bool = False) -> pd.DataFrame:
+    """Convert every column of a snapshot to the type declared by the registry.
+
+    With `report`, the memory saved against the original frame is logged.
+    """
+
+    typed = pd.DataFrame({column: _enforce_column(data_frame[column], column_type(column))
+                          for column in data_frame.columns},
+                         index=data_frame.index)
+
+    if report:
+        log_memory_report(data_frame, typed)
+
+    return typed
+
+
+def log_memory_report(original: pd.DataFrame, typed: pd.DataFrame) -> None:
+    """Log the memory used by a snapshot before and after enforcing the schema."""
+
+    before = original.memory_usage(deep=True).sum()
+    after = typed.memory_usage(deep=True).sum()
+    saved = 1 - after / before if before else 0.0
+
+    logger.info(f'Snapshot memory: {before / 1_048_576:.2f} MiB -> {after / 1_048_576:.2f} MiB '
+                f'({saved:.1%} saved, {len(typed)} rows)')
+
+
+def snapshot_schema(columns: list) -> pa.Schema:
+    """Build the arrow schema of a snapshot with the given columns."""
+
+    return pa.schema([pa.field(column, _ARROW_TYPES[column_type(column)]) for column in columns])
+
+
+def to_arrow_table(data_frame: pd.DataFrame) -> pa.Table:
+    """Convert a snapshot DataFrame to an arrow table with the snapshot schema."""
+
+    schema = snapshot_schema(list(data_frame.columns))
+
+    arrays = []
+    for field in schema:
+        column = _enforce_column(data_frame[field.name], column_type(field.name))
+
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(column.astype('string'), type=pa.string()).dictionary_encode())
+        elif field.type == pa.string():
+            arrays.append(pa.array(column.astype('string'), type=pa.string()))
+        elif field.type == pa.date32():
+            arrays.append(pa.array(column.dt.date, type=pa.date32(), from_pandas=True))
+        else:
+            arrays.append(pa.array(column, type=field.type, from_pandas=True))
+
+    return pa.Table.from_arrays(arrays, schema=schema)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: screener.py
+#  Version: 0.0.1
+#  Summary: Fundamentus Hub
+#           Este projeto cria um dashboard utilizando a API pyfundamentus para
+#           exibir os principais indicadores financeiros das empresas listadas
+#           na B3, facilitando a análise fundamentalista através de visualizações
+#           claras e acessíveis para investidores e analistas.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""Vectorized screening of a snapshot: threshold filters and ranking."""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class ScreenerFilter(NamedTuple):
+    """Bounds of a metric, both included; a None bound is not checked."""
+
+    column: str
+    minimum: float = None
+    maximum: float = None
+
+
+def screen_snapshot(snapshot: pd.DataFrame,
+                    filters: list,
+                    sort_by: str = None,
+                    ascending: bool = True) -> pd.DataFrame:
+    """Rows of a snapshot within the bounds of every filter, ranked by a metric.
+
+    Each filter is a boolean mask over a whole column, combined with the
+    others before a single row selection. Missing values never pass a bound
+    and are ranked last.
+    """
+
+    mask = np.ones(len(snapshot), dtype=bool)
+
+    for screener_filter in filters:
+        values = snapshot[screener_filter.column].to_numpy(dtype='float64', na_value=np.nan)
+
+        if screener_filter.minimum is not None:
+            mask &= values >= screener_filter.minimum
+        if screener_filter.maximum is not None:
+            mask &= values <= screener_filter.maximum
+
+    positions = np.flatnonzero(mask)
+
+    if sort_by is not None:
+        keys = snapshot[sort_by].to_numpy(dtype='float64', na_value=np.nan)[positions]
+        # NaN sorts last in both directions.
+        positions = positions[np.argsort(keys if ascending else -keys, kind='stable')]
+
+    return snapshot.iloc[positions]
@@ -22,10 +22,20 @@ import streamlit as st
 
 from fundamentus_hub.dashboard.footer import dasboard_footer
 from fundamentus_hub.dashboard.index import dasboard_index
+from fundamentus_hub.dashboard.screener import dashboard_screener
+from fundamentus_hub.downloader.cache import CachedStockFetcher
+from fundamentus_hub.downloader.engine import create_fetch_engine
+from fundamentus_hub.downloader.resilience import ResilientStockFetcher, RetryPolicy
+from fundamentus_hub.downloader.throttle import RateLimitedStockFetcher
+from fundamentus_hub.downloader.universe import UniverseCachedStockFetcher
 from fundamentus_hub.downloader.handler import (DataPersister,
                                                 DataProcessor,
                                                 DownloadHandler,
-                                                StockFetcher)
+                                                StockFetcher,
+                                                StreamingDataPersister)
+from fundamentus_hub.storage.manifest import SnapshotManifest
+from fundamentus_hub.storage.peers import write_peer_statistics
+from fundamentus_hub.storage.snapshots import SnapshotStore
 from fundamentus_hub.utilities.categories import FundamentusCategories as Categories
 from fundamentus_hub.utilities.configuration import DownloadHandler as DownloadCfg
 from fundamentus_hub.utilities.configuration import StreamlitConfiguration as StreamlitCfg
@@ -51,6 +61,47 @@ def get_arguments() -> argparse.Namespace:
                         action='store_true',
                         help='Download data from fundamentus API.')
 
+    parser.add_argument('-e',
+                        '--engine',
+                        choices=['thread', 'async'],
+                        default=DownloadCfg.FETCH_ENGINE.value,
+                        help='Fetch engine used by --download.')
+
+    parser.add_argument('-c',
+                        '--concurrency',
+                        type=int,
+                        default=None,
+                        help='Maximum number of in-flight requests.')
+
+    parser.add_argument('-r',
+                        '--rate',
+                        type=float,
+                        default=None,
+                        help='Requests per second budget of the async engine (0 disables it).')
+
+    parser.add_argument('-f',
+                        '--fresh',
+                        action='store_true',
+                        help='Discard the checkpoint journal of the day and download everything again.')
+
+    parser.add_argument('--retries',
+                        type=int,
+                        default=DownloadCfg.RETRY_ATTEMPTS.value,
+                        help='Attempts per ticket on transient errors (1 disables retries).')
+
+    parser.add_argument('--cache',
+                        action='store_true',
+                        help='Serve responses from the on-disk cache while they are fresh.')
+
+    parser.add_argument('-s',
+                        '--stream',
+                        action='store_true',
+                        help='Append each row to the output file as soon as it is processed.')
+
+    parser.add_argument('--import-snapshots',
+                        action='store_true',
+                        help='Import the dated snapshot files of the data directory into the snapshot store.')
+
     parser.add_argument('-b',
                         '--dashboard',
                         action='store_true',
@@ -64,22 +115,52 @@ def get_arguments() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def download_fundamentus_data(portfolio: list) -> None:
+def download_fundamentus_data(portfolio: list,  # pylint: disable=too-many-arguments
+                              *,
+                              engine: str = DownloadCfg.FETCH_ENGINE.value,
+                              concurrency: int = None,
+                              rate: float = None,
+                              resume: bool = True,
+                              cache: bool = False,
+                              stream: bool = False,
+                              retries: int = DownloadCfg.RETRY_ATTEMPTS.value) -> None:
     """Download data from fundamentus API"""
 
     # Create a StockFetcher instance.
     fetcher = StockFetcher()
+    if engine == 'async':
+        # Every request sent to the host takes a slot, retries included and cache hits not.
+        fetcher = RateLimitedStockFetcher(
+            fetcher, rate if rate is not None else DownloadCfg.REQUESTS_PER_SECOND.value)
+    # Retry transient errors.
+    fetcher = ResilientStockFetcher(fetcher, RetryPolicy(max_attempts=retries))
+    if cache:
+        fetcher = response_cache = CachedStockFetcher(fetcher)
+    # Keep the list of all tickets on disk.
+    fetcher = UniverseCachedStockFetcher(fetcher)
     # Create a DataProcessor instance.
     processor = DataProcessor(Categories.categories.value)
     # Create a DataPersister instance.
-    persister = DataPersister()
+    persister = StreamingDataPersister() if stream else DataPersister()
+
+    # Create the fetch engine.
+    fetch_engine = create_fetch_engine(engine, concurrency)
 
     # Create a DownloadHandler instance.
-    handler = DownloadHandler(fetcher, processor, persister)
+    handler = DownloadHandler(fetcher, processor, persister, fetch_engine)
 
     handler.run(portfolio,
                 DownloadCfg.DATA_FILE.value,
-                DownloadCfg.DATA_FORMAT.value)
+                DownloadCfg.DATA_FORMAT.value,
+                resume=resume)
+
+    # Peer statistics are computed once per snapshot, not by the dashboard.
+    manifest = SnapshotManifest()
+    if manifest.latest() is not None:
+        write_peer_statistics(manifest, manifest.latest())
+
+    if cache:
+        response_cache.report()
 
 
 def main_streamlit_app(portfolio: list) -> None:
@@ -91,7 +172,14 @@ def main_streamlit_app(portfolio: list) -> None:
 
     st.write(StreamlitCfg.DESCRIPTION.value)
 
-    dasboard_index(portfolio)
+    def portfolio_page() -> None:
+        """Portfolio page."""
+
+        dasboard_index(portfolio)
+
+    page = st.navigation([st.Page(portfolio_page, title='Carteira', icon='📊', default=True),
+                          st.Page(dashboard_screener, title='Screener', icon='🔎')])
+    page.run()
 
     dasboard_footer()
 
@@ -104,9 +192,19 @@ if __name__ == '__main__':
     # Get the arguments.
     args = get_arguments()
 
-    if args.download:
+    if args.import_snapshots:
+        # Copy the dated snapshot files into the snapshot store.
+        SnapshotStore().import_snapshots()
+    elif args.download:
         # Download data from fundamentus API.
-        download_fundamentus_data([])
+        download_fundamentus_data([],
+                                  engine=args.engine,
+                                  concurrency=args.concurrency,
+                                  rate=args.rate,
+                                  resume=not args.fresh,
+                                  cache=args.cache,
+                                  stream=args.stream,
+                                  retries=args.retries)
     else:
         # Run the Streamlit dashboard.
         main_streamlit_app(test_portfolio)